@@ -1,173 +1,178 @@
 #!/usr/bin/env python3
 """
 배치 토큰 검증 및 정리 스크립트
-- 모든 사용자의 토큰을 테스트하여 유효하지 않은 토큰 식별
-- NotRegistered 토큰 자동 제거
-- 배치 처리 지원
+- device_tokens 컬렉션을 _id 순서로 스트리밍하며 검증 (전체를 메모리에 올리지 않음)
+- FCM dry-run 멀티캐스트(최대 500개)로 실제 발송 없이 토큰 검증, 여러 배치를 동시에 요청
+- NotRegistered / InvalidToken 토큰을 페이지마다 delete_many 한 번으로 제거 (--remove)
+- 페이지마다 진행 상황을 job_checkpoints 컬렉션에 저장해 중단 후 이어서 실행
+- 배치 요청 자체가 실패하면(인증/네트워크/시계 오차 등) 토큰을 지우지 않고 재시도, 계속 실패하면
+  체크포인트를 넘기지 않고 작업을 중단
+
+사용법:
+    python batch_validate_tokens.py [--remove] [--concurrency 4] [--page-size 2000] [--restart]
 """
+import argparse
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
-from utils.push_notification import send_push_notification, PushNotificationError
-import json
-import tempfile
-import firebase_admin
-from firebase_admin import credentials, messaging
+from utils.fcm_pacer import FCM_MAX_RETRIES, backoff_delay
+from utils.push_notification import (
+    INVALID_TOKEN_ERRORS,
+    BatchSendError,
+    classify_exception,
+    prune_invalid_tokens,
+    send_multicast_batch,
+)
+from utils.push_transport import get_push_transport
 
 load_dotenv()
 
-MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-MONGODB_DB = os.getenv("MONGODB_DB", "sns_db")
-BATCH_SIZE = 50  # 한 번에 처리할 토큰 수
-
-async def batch_validate_tokens(dry_run: bool = True):
-    """
-    배치로 토큰 검증
-    - dry_run=True: 결과만 표시
-    - dry_run=False: 실제로 무효 토큰 제거
-    """
-    client = AsyncIOMotorClient(MONGODB_URL)
-    db = client[MONGODB_DB]
-    
+MONGO_URI = os.getenv("MONGO_URI") or os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "sns_db")
+CHECKPOINT_ID = "batch_validate_tokens"
+
+
+async def load_checkpoint(db, restart: bool) -> dict:
+    if restart:
+        await db.job_checkpoints.delete_one({"_id": CHECKPOINT_ID})
+        return {}
+    return await db.job_checkpoints.find_one({"_id": CHECKPOINT_ID}) or {}
+
+
+async def save_checkpoint(db, last_id, totals: Counter, done: bool = False):
+    await db.job_checkpoints.update_one(
+        {"_id": CHECKPOINT_ID},
+        {"$set": {
+            "last_id": last_id,
+            "totals": dict(totals),
+            "done": done,
+            "updated_at": datetime.now(timezone.utc),
+        }},
+        upsert=True,
+    )
+
+
+class ValidationAborted(Exception):
+    """배치 요청이 재시도 후에도 실패해 작업을 중단 (체크포인트는 마지막 완료 페이지에 머묾)"""
+
+
+async def validate_chunk(chunk: list[tuple[str, str]], slots: asyncio.Semaphore) -> list[tuple[str, str, str]]:
+    """(사용자 ID, 토큰) 최대 500개를 dry-run으로 검증. 실패한 (사용자 ID, 토큰, 에러 분류) 반환"""
+    tokens = [token for _, token in chunk]
+    for attempt in range(FCM_MAX_RETRIES + 1):
+        async with slots:
+            results = await send_multicast_batch(tokens, "validation", "validation", dry_run=True)
+        # 모든 결과가 같은 배치 에러면 토큰 문제가 아니므로 분류/삭제하지 않음
+        batch_error = results[0][1] if results else None
+        if not isinstance(batch_error, BatchSendError):
+            break
+        if attempt == FCM_MAX_RETRIES:
+            raise ValidationAborted(str(batch_error))
+        delay = backoff_delay(attempt)
+        print(f"🔁 배치 검증 요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{FCM_MAX_RETRIES}): {batch_error}")
+        await asyncio.sleep(delay)
+    return [
+        (user_id, token, classify_exception(error))
+        for (user_id, _), (token, error) in zip(chunk, results)
+        if error is not None
+    ]
+
+
+async def validate_page(db, docs: list, slots: asyncio.Semaphore, remove: bool, totals: Counter):
+    pairs = [(doc["owner_id"], doc["token"]) for doc in docs]
+    batch_size = get_push_transport().max_batch_size
+    chunks = [pairs[i:i + batch_size] for i in range(0, len(pairs), batch_size)]
+    failures = [row for rows in await asyncio.gather(*(validate_chunk(chunk, slots) for chunk in chunks)) for row in rows]
+
+    invalid_by_user = defaultdict(list)
+    for user_id, token, error_type in failures:
+        totals[error_type] += 1
+        if error_type in INVALID_TOKEN_ERRORS:
+            invalid_by_user[user_id].append(token)
+    totals["tokens"] += len(pairs)
+    totals["valid"] += len(pairs) - len(failures)
+
+    if remove and invalid_by_user:
+        totals["removed"] += await prune_invalid_tokens(db, invalid_by_user)
+
+
+async def batch_validate_tokens(remove: bool, concurrency: int, page_size: int, restart: bool):
+    if not await get_push_transport().ensure_ready():
+        print("❌ Firebase 초기화 실패: 토큰을 검증할 수 없습니다.")
+        return
+
+    client = AsyncIOMotorClient(MONGO_URI)
+    db = client[DATABASE_NAME]
     try:
         print("=" * 70)
         print("배치 토큰 검증 스크립트")
         print("=" * 70)
-        print(f"모드: {'드라이런 (변경 없음)' if dry_run else '실제 실행 (토큰 제거)'}")
+        print(f"모드: {'실제 실행 (토큰 제거)' if remove else '검증만 (변경 없음)'} / 동시 요청 {concurrency}개")
+
+        checkpoint = await load_checkpoint(db, restart)
+        if checkpoint.get("done"):
+            print("✅ 이전 실행이 완료되었습니다. 다시 검증하려면 --restart 옵션을 사용하세요.")
+            return
+        last_id = checkpoint.get("last_id")
+        totals = Counter(checkpoint.get("totals", {}))
+        if last_id:
+            print(f"↪️  체크포인트에서 이어서 실행: {last_id} 이후 (토큰 {totals['tokens']}개 처리됨)")
         print()
-        
-        # 토큰이 있는 사용자 조회
-        all_users = await db.users.find(
-            {"device_token": {"$ne": None}}
-        ).to_list(None)
-        
-        total_users = len(all_users)
-        print(f"📊 검증할 사용자: {total_users}명\n")
-        
-        invalid_tokens = []
-        valid_tokens = []
-        
-        # 배치 처리
-        for batch_num, i in enumerate(range(0, total_users, BATCH_SIZE)):
-            batch = all_users[i:i+BATCH_SIZE]
-            batch_invalid = []
-            
-            print(f"🔄 배치 {batch_num + 1} 처리 중... ({i+1}-{min(i+BATCH_SIZE, total_users)}/{total_users})")
-            
-            for user in batch:
-                token = user.get("device_token")
-                user_id = user["_id"]
-                email = user.get("email", "unknown")
-                
-                if not token:
-                    continue
-                
-                # 각 토큰에 대해 스토리지 메시지 전송 시도 (실제 발송하지 않음)
-                try:
-                    message = messaging.Message(
-                        data={"test": "validation"},
-                        token=token,
-                    )
-                    # dry_run이면 실제 발송하지 않고 검증만 수행
-                    if not dry_run:
-                        response = messaging.send(message)
-                        valid_tokens.append(email)
-                    else:
-                        # dry_run 모드에서는 형식 검증만
-                        if 60 < len(token) < 1000 and not ' ' in token:
-                            valid_tokens.append(email)
-                        else:
-                            batch_invalid.append({
-                                "user_id": user_id,
-                                "email": email,
-                                "reason": "형식 오류"
-                            })
-                
-                except Exception as e:
-                    error_str = str(e).lower()
-                    
-                    if "notregistered" in error_str:
-                        batch_invalid.append({
-                            "user_id": user_id,
-                            "email": email,
-                            "reason": "NotRegistered"
-                        })
-                    elif "invalid" in error_str:
-                        batch_invalid.append({
-                            "user_id": user_id,
-                            "email": email,
-                            "reason": "Invalid Token"
-                        })
-                    else:
-                        batch_invalid.append({
-                            "user_id": user_id,
-                            "email": email,
-                            "reason": str(e)[:50]
-                        })
-            
-            invalid_tokens.extend(batch_invalid)
-            
-            if batch_invalid:
-                print(f"  ⚠️  {len(batch_invalid)}개의 무효 토큰 발견\n")
-            else:
-                print(f"  ✅ 모든 토큰 유효\n")
-        
-        # 결과 정리
+
+        query = {"_id": {"$gt": last_id}} if last_id else {}
+        cursor = db.device_tokens.find(query, {"token": 1, "owner_id": 1}).sort("_id", 1).batch_size(page_size)
+
+        slots = asyncio.Semaphore(concurrency)
+        page = []
+        try:
+            async for doc in cursor:
+                page.append(doc)
+                if len(page) == page_size:
+                    await validate_page(db, page, slots, remove, totals)
+                    last_id = page[-1]["_id"]
+                    await save_checkpoint(db, last_id, totals)
+                    print(f"🔄 토큰 {totals['tokens']}개 검증 (유효 {totals['valid']}개)")
+                    page = []
+            if page:
+                await validate_page(db, page, slots, remove, totals)
+                last_id = page[-1]["_id"]
+        except ValidationAborted as e:
+            # 이번 페이지는 삭제/체크포인트 없이 중단 → 다음 실행 때 이 페이지부터 다시 검증
+            print(f"\n❌ 배치 요청이 계속 실패해 중단합니다: {e}")
+            print("   이번 페이지의 토큰은 삭제하지 않았습니다. 원인을 해결한 뒤 다시 실행하면 마지막 체크포인트부터 이어서 검증합니다.")
+            return
+        await save_checkpoint(db, last_id, totals, done=True)
+
         print("\n" + "=" * 70)
         print("📊 검증 결과")
         print("=" * 70)
-        print(f"✅ 유효한 토큰: {len(valid_tokens)}개")
-        print(f"❌ 무효한 토큰: {len(invalid_tokens)}개")
-        
-        if invalid_tokens:
-            print(f"\n📋 무효한 토큰 목록 (처음 20개):")
-            for i, item in enumerate(invalid_tokens[:20], 1):
-                print(f"  {i:2}. {item['email']:30} - {item['reason']}")
-            
-            if len(invalid_tokens) > 20:
-                print(f"  ... 외 {len(invalid_tokens) - 20}개")
-            
-            # 실제 실행 모드에서 토큰 제거
-            if not dry_run:
-                print(f"\n🗑️  무효 토큰 제거 중...")
-                user_ids_to_clean = [item["user_id"] for item in invalid_tokens]
-                
-                result = await db.users.update_many(
-                    {"_id": {"$in": user_ids_to_clean}},
-                    {"$set": {"device_token": None}}
-                )
-                
-                print(f"✅ {result.modified_count}개 사용자의 토큰 제거됨")
-            else:
-                print(f"\n💡 드라이런 모드: 실제로 제거되지 않았습니다.")
-                print(f"실제 실행하려면 다시 실행해주세요.")
+        print(f"  - 토큰: {totals['tokens']}개 (유효 {totals['valid']}개)")
+        for error_type in sorted(set(totals) - {"tokens", "valid", "removed"}):
+            print(f"  - {error_type}: {totals[error_type]}개")
+        if remove:
+            print(f"🗑️  제거한 무효 토큰: {totals['removed']}개")
         else:
-            print(f"\n✅ 모든 토큰이 유효합니다!")
-        
-        # 최종 통계
-        print(f"\n📈 최종 통계:")
-        users_after = await db.users.count_documents({"device_token": {"$ne": None}})
-        total_after = await db.users.count_documents({})
-        
-        print(f"  - 전체 사용자: {total_after}")
-        print(f"  - 유효한 토큰: {users_after}")
-        print(f"  - 토큰 보유율: {users_after/total_after*100:.1f}%")
-    
+            print("\n💡 검증만 수행했습니다. 무효 토큰을 제거하려면 --remove 옵션을 사용하세요.")
     finally:
         client.close()
 
+
 if __name__ == "__main__":
-    import sys
-    
-    # 명령행 인자 처리
-    dry_run = True
-    if len(sys.argv) > 1 and sys.argv[1] == "--remove":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--remove", action="store_true", help="무효 토큰을 실제로 제거")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 보낼 dry-run 배치 수")
+    parser.add_argument("--page-size", type=int, default=2000, help="체크포인트 단위 토큰 수")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터 실행")
+    args = parser.parse_args()
+
+    if args.remove:
         response = input("\n⚠️  경고: 이 작업은 무효한 토큰을 실제로 제거합니다.\n계속하시겠습니까? (yes/no): ").lower()
-        if response == "yes":
-            dry_run = False
-        else:
+        if response != "yes":
             print("취소되었습니다.")
             sys.exit(0)
-    
-    asyncio.run(batch_validate_tokens(dry_run=dry_run))
+
+    asyncio.run(batch_validate_tokens(args.remove, args.concurrency, args.page_size, args.restart))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+피드 페이지네이션 벤치마크
+- 별도 벤치마크 DB에 합성 게시글을 시드
+- page(skip) 방식과 cursor(키셋) 방식의 1페이지 / 깊은 페이지 지연시간 비교
+
+사용법:
+    python bench_feed_pagination.py [--pages 1000] [--limit 50] [--category 일상]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from utils.pagination import NEWEST_FIRST, encode_cursor, keyset_filter
+from utils.indexes import index_models
+
+load_dotenv()
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DB = os.getenv("BENCH_DATABASE_NAME", "sns_bench")
+CATEGORIES = ["공지", "일상", "영화", "게임"]
+REPEAT = 20
+
+
+async def seed_posts(db, total: int):
+    existing = await db.posts.estimated_document_count()
+    if existing >= total:
+        return
+    print(f"🌱 게시글 {total - existing}개 시드 중...")
+    base = datetime.now(timezone.utc)
+    batch = []
+    for i in range(existing, total):
+        batch.append({
+            "author_id": "000000000000000000000000",
+            "author_username": "bench",
+            "author_display_name": "bench",
+            "content": f"bench post {i}",
+            "category": random.choice(CATEGORIES),
+            "liked_by": [],
+            # 동일 created_at이 섞이도록 일부 게시글은 같은 초에 생성
+            "created_at": base - timedelta(seconds=i // 3),
+            "updated_at": None,
+        })
+        if len(batch) == 5000:
+            await db.posts.insert_many(batch)
+            batch = []
+    if batch:
+        await db.posts.insert_many(batch)
+    await db.posts.create_indexes(index_models("posts"))
+
+
+async def time_query(make_cursor) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        await make_cursor().to_list(length=None)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run(pages: int, limit: int, category: str):
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[BENCH_DB]
+    try:
+        await seed_posts(db, pages * limit * (len(CATEGORIES) if category else 1))
+
+        query = {"category": category} if category else {}
+        deep_skip = (pages - 1) * limit
+
+        # 깊은 페이지 직전 문서로 커서 생성 (측정 대상 아님)
+        boundary = await db.posts.find(query).sort(NEWEST_FIRST).skip(deep_skip - 1).limit(1).to_list(1)
+        if not boundary:
+            print("❌ 시드 데이터가 부족합니다.")
+            return
+        deep_cursor = encode_cursor(boundary[0])
+
+        results = {
+            "page 1 (skip)": await time_query(
+                lambda: db.posts.find(query).sort(NEWEST_FIRST).limit(limit)),
+            f"page {pages} (skip)": await time_query(
+                lambda: db.posts.find(query).sort(NEWEST_FIRST).skip(deep_skip).limit(limit)),
+            "page 1 (cursor)": await time_query(
+                lambda: db.posts.find(query).sort(NEWEST_FIRST).limit(limit)),
+            f"page {pages} (cursor)": await time_query(
+                lambda: db.posts.find({**query, **keyset_filter(deep_cursor)}).sort(NEWEST_FIRST).limit(limit)),
+        }
+
+        print("=" * 50)
+        print(f"📊 피드 페이지네이션 (limit={limit}, category={category or '전체'})")
+        print("=" * 50)
+        for name, ms in results.items():
+            print(f"  {name:24} {ms:8.2f} ms (median of {REPEAT})")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--category", default=None)
+    args = parser.parse_args()
+    asyncio.run(run(args.pages, args.limit, args.category))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+목록 응답 직렬화 마이크로벤치마크 (DB 없이 실행)
+- 기본 경로: 모델 목록을 반환 → FastAPI가 response_model로 재검증 후 JSONResponse(json.dumps)
+- 빠른 경로: utils/fast_json.py의 dumps_models (pydantic-core Rust 직렬화, 재검증 없음)
+- list_posts / list_comments / get_notifications / get_all_users 응답 모델을 100개, 500개로 비교
+- 두 경로의 응답 바이트가 같은지도 확인
+
+사용법:
+    python bench_json_responses.py [--sizes 100,500] [--repeat 200]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+import main
+from models.comment import CommentResponse
+from models.notification import NotificationResponse
+from models.post import PostResponse
+from models.user import UserResponse
+from utils import fast_json
+
+NOW = datetime.now(timezone.utc).replace(microsecond=123000)
+
+
+def make_post(i: int) -> PostResponse:
+    return PostResponse(
+        id=f"{i:024x}",
+        author_id=f"{i % 50:024x}",
+        author_username=f"user{i % 50}",
+        author_display_name=f"사용자 {i % 50}",
+        author_profile_image="https://res.cloudinary.com/demo/image/upload/sample.jpg",
+        content=f"오늘의 게시글 {i} 🎬 \"따옴표\"와 줄바꿈\n포함",
+        category="일상",
+        likes_count=i % 40,
+        liked_by=[f"{n:024x}" for n in range(i % 5)],
+        created_at=NOW - timedelta(minutes=i),
+        updated_at=NOW if i % 7 == 0 else None,
+        liked_by_me=i % 3 == 0,
+    )
+
+
+def make_comment(i: int) -> CommentResponse:
+    return CommentResponse(
+        id=f"{i:024x}",
+        post_id="0" * 24,
+        parent_id=f"{i - 1:024x}" if i % 4 else None,
+        author_id=f"{i % 50:024x}",
+        author_username=f"user{i % 50}",
+        author_display_name=f"사용자 {i % 50}",
+        content=f"댓글 {i}",
+        created_at=NOW - timedelta(seconds=i),
+    )
+
+
+def make_notification(i: int) -> NotificationResponse:
+    return NotificationResponse(
+        id=f"{i:024x}",
+        recipient_id="0" * 24,
+        actor_id=f"{i % 50:024x}",
+        actor_username=f"user{i % 50}",
+        actor_display_name=f"사용자 {i % 50}",
+        type="like",
+        post_id=f"{i:024x}",
+        message=f"사용자 {i % 50}님이 게시글에 좋아요를 눌렀습니다.",
+        is_read=i % 2 == 0,
+        created_at=NOW - timedelta(minutes=i),
+    )
+
+
+def make_user(i: int) -> UserResponse:
+    return UserResponse(
+        id=f"{i:024x}",
+        username=f"user{i}",
+        email="us***@example.com",
+        display_name=f"사용자 {i}",
+        bio="안녕하세요" if i % 2 else None,
+        created_at=NOW - timedelta(days=i),
+    )
+
+
+ENDPOINTS = [
+    ("list_posts", "/api/posts/", make_post),
+    ("list_comments", "/api/posts/{post_id}/comments", make_comment),
+    ("get_notifications", "/api/notifications/", make_notification),
+    ("get_all_users", "/api/users/list", make_user),
+]
+
+
+def response_field(path: str):
+    for route in main.app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+async def default_path(field, models: list) -> bytes:
+    content = await serialize_response(field=field, response_content=models)
+    return JSONResponse(content).body
+
+
+def per_call_ms(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def run(sizes: list[int], repeat: int):
+    loop = asyncio.new_event_loop()
+    print("=" * 78)
+    print(f"📊 목록 응답 직렬화 (반복 {repeat}회)")
+    print("=" * 78)
+    try:
+        for name, path, factory in ENDPOINTS:
+            field = response_field(path)
+            for size in sizes:
+                models = [factory(i) for i in range(size)]
+                default_body = loop.run_until_complete(default_path(field, models))
+                fast_body = fast_json.dumps_models(models)
+                if fast_body != default_body:
+                    raise AssertionError(f"{name} ({size}): 응답 바이트가 다릅니다")
+                default_ms = per_call_ms(lambda: loop.run_until_complete(default_path(field, models)), repeat)
+                fast_ms = per_call_ms(lambda: fast_json.dumps_models(models), repeat)
+                print(
+                    f"  {name:18} {size:4}개  기본 {default_ms:7.2f} ms  빠른 경로 {fast_ms:7.2f} ms"
+                    f"  ({default_ms / fast_ms:4.1f}x, {len(fast_body) / 1024:6.1f} KB, 바이트 동일)"
+                )
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,500", help="콤마로 구분한 목록 크기")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.repeat)
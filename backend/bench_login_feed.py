@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+로그인 폭주 중 피드 지연시간 벤치마크
+- 벤치마크 DB에 사용자/게시글을 시드하고 main:app을 프로세스 안에서 직접 호출 (ASGI)
+- 피드(GET /api/posts/)를 계속 요청하는 동안 로그인을 동시에 보내 피드 p50/p99 측정
+- 비교: 로그인 없음 / bcrypt를 이벤트 루프에서 실행(이전 방식) / bcrypt 스레드 풀(현재 방식)
+
+사용법:
+    python bench_login_feed.py [--duration 5] [--feed-clients 20] [--logins 10] [--interval-ms 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import main
+from routes import users as users_routes
+from utils.rate_limit import limiter
+from utils.auth import hash_password, verify_password
+from utils.indexes import ensure_indexes
+
+load_dotenv()
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DB = os.getenv("BENCH_DATABASE_NAME", "sns_bench")
+BENCH_EMAIL = "bench-login@example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+async def asgi_request(method: str, path: str, body: dict = None) -> int:
+    """HTTP 서버 없이 main.app을 직접 호출하고 상태 코드 반환"""
+    path, _, query = path.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await main.app(scope, receive, send)
+    return status
+
+
+async def seed(db):
+    if not await db.users.find_one({"email": BENCH_EMAIL}):
+        result = await db.users.insert_one({
+            "username": "bench_login",
+            "email": BENCH_EMAIL,
+            "password": hash_password(BENCH_PASSWORD),
+            "display_name": "bench",
+            "created_at": datetime.now(timezone.utc),
+        })
+        now = datetime.now(timezone.utc)
+        await db.posts.insert_many([{
+            "author_id": str(result.inserted_id),
+            "content": f"bench post {i}",
+            "category": "일상",
+            "liked_by": [],
+            "likes_count": 0,
+            "created_at": now - timedelta(seconds=i),
+        } for i in range(200)])
+    await ensure_indexes(db, background=False)
+
+
+async def run_scenario(duration: float, feed_clients: int, logins: int, interval: float) -> list[float]:
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def feed_client():
+        # interval마다 요청을 예약하고 예약 시각부터 응답까지 측정 (이벤트 루프가 멈춘 시간도 포함)
+        scheduled = time.perf_counter()
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await asgi_request("GET", "/api/posts/?limit=20")
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+            scheduled += interval
+
+    async def login_client():
+        while time.perf_counter() < deadline:
+            status = await asgi_request("POST", "/api/users/login", {"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+            if status != 200:
+                raise RuntimeError(f"login failed: {status}")
+
+    await asyncio.gather(*[feed_client() for _ in range(feed_clients)], *[login_client() for _ in range(logins)])
+    return latencies
+
+
+async def run(duration: float, feed_clients: int, logins: int, interval_ms: float):
+    client = AsyncIOMotorClient(MONGODB_URL)
+    main.app.mongodb = client[BENCH_DB]
+    # 벤치마크 중에는 로그인 rate limit 해제
+    limiter.enabled = False
+    try:
+        await seed(main.app.mongodb)
+
+        async def verify_on_event_loop(plain_password: str, hashed_password: str) -> bool:
+            return verify_password(plain_password, hashed_password)
+
+        executor_verify = users_routes.verify_password_async
+        scenarios = [
+            ("로그인 없음", 0, executor_verify),
+            ("bcrypt 이벤트 루프 (이전)", logins, verify_on_event_loop),
+            ("bcrypt 스레드 풀 (현재)", logins, executor_verify),
+        ]
+        results = []
+        for name, login_count, verify in scenarios:
+            users_routes.verify_password_async = verify
+            latencies = await run_scenario(duration, feed_clients, login_count, interval_ms / 1000)
+            results.append((name, latencies))
+        users_routes.verify_password_async = executor_verify
+
+        print("=" * 70)
+        print(f"📊 피드 지연시간 (피드 클라이언트 {feed_clients}, 동시 로그인 {logins}, {duration:.0f}초)")
+        print("=" * 70)
+        for name, latencies in results:
+            ordered = sorted(latencies)
+            p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            print(f"  {name:28} 요청 {len(latencies):6}  p50 {statistics.median(latencies):8.1f} ms  p99 {p99:8.1f} ms")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--feed-clients", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=10)
+    parser.add_argument("--interval-ms", type=float, default=20, help="피드 클라이언트별 요청 간격")
+    args = parser.parse_args()
+    asyncio.run(run(args.duration, args.feed_clients, args.logins, args.interval_ms))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+푸시 파이프라인 벤치마크 (네트워크/Firebase 없이 실행)
+- utils/push_transport.py의 FakeTransport로 FCM 지연시간, 에러 비율, 배치 한도를 흉내 냄
+- send_push_notification을 동시에 여러 번 호출해 처리량, 지연시간, 재시도/에러 처리를 측정
+- pacer(utils/fcm_pacer.py) 속도 제한과 재시도 백오프가 그대로 적용됨
+
+사용법:
+    python bench_push_pipeline.py [--notifications 1000] [--tokens-per 3] [--concurrency 50]
+        [--latency-ms 50] [--not-registered 0.02] [--rate-limit 0.01] [--internal 0.01]
+        [--max-batch 500] [--send-rate 500] [--retry-base 0.05] [--seed 42]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+from utils import fcm_pacer as pacer_module
+from utils.fcm_pacer import TokenBucketPacer
+from utils.push_transport import FakeTransport, set_push_transport
+from utils import push_notification
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def run(args):
+    transport = FakeTransport(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        not_registered_rate=args.not_registered,
+        rate_limit_rate=args.rate_limit,
+        internal_error_rate=args.internal,
+        max_batch_size=args.max_batch,
+        seed=args.seed,
+    )
+    set_push_transport(transport)
+    pacer = TokenBucketPacer(rate=args.send_rate, capacity=args.send_rate * 2)
+    push_notification.fcm_pacer = pacer
+    pacer_module.FCM_RETRY_BASE_SECONDS = args.retry_base
+
+    slots = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    totals = {"success": 0, "failure": 0}
+
+    async def send_one(i: int):
+        tokens = [f"bench-{i}-{n}" for n in range(args.tokens_per)]
+        async with slots:
+            started = time.perf_counter()
+            result = await push_notification.send_push_notification(tokens, "bench", f"notification {i}")
+            latencies.append((time.perf_counter() - started) * 1000)
+        totals["success"] += result["success_count"]
+        totals["failure"] += result["failure_count"]
+
+    started = time.perf_counter()
+    # send_push_notification의 전송 로그는 숨김
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(send_one(i) for i in range(args.notifications)))
+    elapsed = time.perf_counter() - started
+
+    messages = args.notifications * args.tokens_per
+    print("=" * 60)
+    print(f"📊 푸시 파이프라인 (알림 {args.notifications}개 x 토큰 {args.tokens_per}개, 동시 {args.concurrency})")
+    print("=" * 60)
+    print(f"  소요 시간          {elapsed:8.2f} s")
+    print(f"  처리량             {messages / elapsed:8.1f} msg/s")
+    print(f"  알림 지연 p50      {statistics.median(latencies):8.1f} ms")
+    print(f"  알림 지연 p99      {percentile(latencies, 0.99):8.1f} ms")
+    print(f"  성공 / 실패        {totals['success']} / {totals['failure']}")
+    print(f"  FCM 배치 요청      {transport.stats['batches']} (메시지 {transport.stats['messages']}개)")
+    print(f"  주입한 에러        {transport.stats['errors']}")
+    print(f"  pacer              {pacer.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--notifications", type=int, default=1000)
+    parser.add_argument("--tokens-per", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50, help="배치 요청 지연시간 중앙값")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="지연시간 로그정규분포 sigma (클수록 꼬리가 김)")
+    parser.add_argument("--not-registered", type=float, default=0.02)
+    parser.add_argument("--rate-limit", type=float, default=0.01)
+    parser.add_argument("--internal", type=float, default=0.01)
+    parser.add_argument("--max-batch", type=int, default=500)
+    parser.add_argument("--send-rate", type=float, default=500, help="pacer 초당 메시지 수")
+    parser.add_argument("--retry-base", type=float, default=0.05, help="재시도 백오프 시작 값 (초)")
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+인덱스 점검 스크립트
+- utils/indexes.py에 등록됐지만 DB에 없는 인덱스
+- DB에 있지만 등록되지 않은 인덱스
+- 서버 재시작 이후 한 번도 사용되지 않은 인덱스 ($indexStats)
+
+사용법:
+    python check_indexes.py           # 점검만
+    python check_indexes.py --create  # 없는 인덱스 생성
+"""
+import asyncio
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+from utils.indexes import ensure_indexes, find_missing_indexes, find_unused_indexes, find_unregistered_indexes
+
+load_dotenv()
+
+MONGODB_URL = os.getenv("MONGO_URI") or os.getenv("MONGODB_URL")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "sns_db")
+
+async def check_indexes(create: bool):
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[DATABASE_NAME]
+    try:
+        missing = await find_missing_indexes(db)
+        print("=" * 60)
+        print("❌ 없는 인덱스" if missing else "✅ 등록된 인덱스가 모두 있습니다")
+        for collection, names in missing.items():
+            for name in names:
+                print(f"  - {collection}.{name}")
+
+        extra = await find_unregistered_indexes(db)
+        if extra:
+            print("\n⚠️ 등록되지 않은 인덱스")
+            for collection, names in extra.items():
+                for name in names:
+                    print(f"  - {collection}.{name}")
+
+        unused = await find_unused_indexes(db)
+        if unused:
+            print("\n💤 사용되지 않은 인덱스")
+            for collection, rows in unused.items():
+                for row in rows:
+                    print(f"  - {collection}.{row['name']} (집계 시작: {row['since']})")
+
+        if create and missing:
+            print("\n🔨 없는 인덱스 생성 중...")
+            await ensure_indexes(db, background=False)
+
+        return 1 if missing and not create else 0
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(check_indexes(create="--create" in sys.argv)))
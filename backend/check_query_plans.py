@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+쿼리 플랜 회귀 검사 스크립트
+- 로컬 mongod의 임시 DB에 합성 데이터를 시드하고 utils/indexes.py 인덱스 생성
+- 라우트가 사용하는 쿼리 형태를 explain("executionStats")로 실행
+- COLLSCAN이 있거나 반환 대비 조회한 문서 수가 너무 많으면 실패 (exit code 1)
+
+라우트에 새 필터/정렬을 추가하면 아래 query_shapes()에도 추가하세요.
+
+사용법:
+    python check_query_plans.py [--keep] [--max-ratio 3]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from routes.posts import comment_threads_pipeline
+from utils.indexes import ensure_indexes
+from utils.pagination import NEWEST_FIRST, encode_cursor, keyset_filter
+
+load_dotenv()
+
+MONGODB_URL = os.getenv("PLAN_CHECK_MONGODB_URL", "mongodb://localhost:27017")
+PLAN_CHECK_DB = os.getenv("PLAN_CHECK_DATABASE_NAME", "sns_plan_check")
+CATEGORIES = ["공지", "일상", "영화", "게임", "전체"]
+
+NUM_USERS = 200
+NUM_POSTS = 5000
+NUM_COMMENTS = 5000
+NUM_NOTIFICATIONS = 5000
+NUM_GUESTBOOK = 1000
+NUM_LIKES = 5000
+NUM_PUSH_OUTBOX = 2000
+NUM_DEVICE_TOKENS = 2000
+
+
+async def seed(db) -> dict:
+    """합성 데이터 시드. 쿼리에 사용할 샘플 ID를 반환"""
+    now = datetime.now(timezone.utc)
+    users = [{
+        "_id": ObjectId(),
+        "username": f"user{i}",
+        "email": f"user{i}@example.com",
+        "display_name": f"User {i}",
+        "created_at": now - timedelta(minutes=i),
+    } for i in range(NUM_USERS)]
+    await db.users.insert_many(users)
+    user_ids = [str(user["_id"]) for user in users]
+
+    posts = [{
+        "_id": ObjectId(),
+        "author_id": random.choice(user_ids),
+        "content": f"post {i}",
+        "category": random.choice(CATEGORIES),
+        "liked_by": [],
+        "likes_count": 0,
+        "created_at": now - timedelta(seconds=i),
+    } for i in range(NUM_POSTS)]
+    await db.posts.insert_many(posts)
+    post_ids = [str(post["_id"]) for post in posts]
+
+    comments = []
+    for i in range(NUM_COMMENTS):
+        parent = random.choice(comments) if comments and i % 4 == 0 else None
+        comments.append({
+            "_id": ObjectId(),
+            "post_id": parent["post_id"] if parent else random.choice(post_ids),
+            "parent_id": str(parent["_id"]) if parent else None,
+            "author_id": random.choice(user_ids),
+            "content": f"comment {i}",
+            "is_deleted": i % 50 == 0,
+            "created_at": now - timedelta(seconds=i),
+        })
+    await db.comments.insert_many(comments)
+
+    await db.notifications.insert_many([{
+        "recipient_id": random.choice(user_ids),
+        "actor_id": random.choice(user_ids),
+        "type": "like",
+        "message": "",
+        "is_read": random.random() < 0.5,
+        "created_at": now - timedelta(seconds=i),
+    } for i in range(NUM_NOTIFICATIONS)])
+
+    await db.guestbook.insert_many([{
+        "profile_user_id": random.choice(user_ids),
+        "author_id": random.choice(user_ids),
+        "content": "",
+        "created_at": now - timedelta(seconds=i),
+    } for i in range(NUM_GUESTBOOK)])
+
+    likes = {(random.choice(post_ids), random.choice(user_ids)) for _ in range(NUM_LIKES)}
+    await db.likes.insert_many([{"post_id": p, "user_id": u, "created_at": now} for p, u in likes])
+
+    await db.push_outbox.insert_many([{
+        "recipient_id": random.choice(user_ids),
+        "title": "",
+        "body": "",
+        "coalesce_key": f"{random.choice(user_ids)}:like:{random.choice(post_ids)}",
+        "status": "sent" if i % 10 else "pending",
+        "attempts": 1,
+        "next_attempt_at": now - timedelta(seconds=i),
+        "created_at": now - timedelta(seconds=i),
+    } for i in range(NUM_PUSH_OUTBOX)])
+
+    await db.device_tokens.insert_many([{
+        "token": f"token-{i}",
+        "owner_id": random.choice(user_ids),
+        "platform": "android",
+        "created_at": now,
+        "last_seen_at": now - timedelta(days=i % 90),
+    } for i in range(NUM_DEVICE_TOKENS)])
+
+    await ensure_indexes(db, background=False)
+
+    busy_post = Counter(comment["post_id"] for comment in comments).most_common(1)[0][0]
+    return {
+        "user_id": user_ids[0],
+        "user_ids": user_ids[:50],
+        "post_id": busy_post,
+        "post_ids": post_ids[:50],
+        "comment_id": str(comments[0]["_id"]),
+        "deleted_comment_ids": [
+            str(comment["_id"]) for comment in comments
+            if comment["is_deleted"] and comment["parent_id"] is None and comment["post_id"] == busy_post
+        ] or [str(comments[0]["_id"])],
+        "email": users[0]["email"],
+        "username": users[0]["username"],
+        "deep_cursor": encode_cursor(posts[NUM_POSTS // 2]),
+    }
+
+
+def query_shapes(s: dict) -> list[dict]:
+    """라우트별 쿼리 형태 (routes/*.py와 동일한 필터/정렬)"""
+    return [
+        # routes/posts.py
+        {"name": "posts.list_posts", "collection": "posts", "filter": {}, "sort": NEWEST_FIRST, "limit": 50},
+        {"name": "posts.list_posts(category)", "collection": "posts", "filter": {"category": "일상"}, "sort": NEWEST_FIRST, "limit": 50},
+        {"name": "posts.list_posts(cursor)", "collection": "posts", "filter": keyset_filter(s["deep_cursor"]), "sort": NEWEST_FIRST, "limit": 50},
+        {"name": "posts.list_posts(category, cursor)", "collection": "posts", "filter": {"category": "일상", **keyset_filter(s["deep_cursor"])}, "sort": NEWEST_FIRST, "limit": 50},
+        {"name": "posts.get_post", "collection": "posts", "filter": {"_id": ObjectId(s["post_id"])}, "limit": 1},
+        {"name": "posts.list_comments", "collection": "comments", "filter": {"post_id": s["post_id"]}, "sort": [("created_at", 1)], "limit": 500},
+        # 삭제된 최상위 댓글 중 대댓글이 남은 것 (list_comments, comment_sweeper)
+        {"name": "posts.list_comments(reply parents)", "collection": "comments", "distinct": "parent_id", "filter": {"parent_id": {"$in": s["deleted_comment_ids"]}}},
+        # 라우트와 같은 파이프라인 ($lookup 안의 parent_id $expr 매치 포함)
+        {"name": "posts.list_comment_threads", "collection": "comments", "pipeline": comment_threads_pipeline(s["post_id"], None, 20, 3)},
+        {"name": "posts.list_comment_replies(parent)", "collection": "comments", "filter": {"_id": ObjectId(s["comment_id"]), "post_id": s["post_id"]}, "limit": 1},
+        {"name": "posts.list_comment_replies", "collection": "comments", "filter": {"parent_id": s["comment_id"]}, "sort": [("created_at", 1), ("_id", 1)], "limit": 50},
+        {"name": "posts.delete_comment(replies)", "collection": "comments", "count": {"parent_id": s["comment_id"]}},
+        {"name": "posts.liked_post_ids", "collection": "likes", "filter": {"user_id": s["user_id"], "post_id": {"$in": s["post_ids"]}}, "projection": {"post_id": 1, "_id": 0}},
+        {"name": "posts.add_like", "collection": "likes", "filter": {"post_id": s["post_id"], "user_id": s["user_id"]}, "limit": 1},
+        # delete_many는 같은 필터의 find로 플랜 확인
+        {"name": "posts.delete_post_likes", "collection": "likes", "filter": {"post_id": s["post_id"]}},
+        {"name": "comment_sweeper", "collection": "comments", "filter": {"is_deleted": True, "parent_id": None}},
+        {"name": "user_loader.load_many", "collection": "users", "filter": {"_id": {"$in": [ObjectId(uid) for uid in s["user_ids"]]}}},
+        # routes/profiles.py
+        {"name": "profiles.get_user_posts", "collection": "posts", "filter": {"author_id": s["user_id"]}, "sort": [("created_at", -1)], "limit": 100},
+        {"name": "profiles.get_guestbook", "collection": "guestbook", "filter": {"profile_user_id": s["user_id"]}, "sort": [("created_at", -1)], "limit": 100},
+        # routes/notifications.py
+        {"name": "notifications.get_notifications", "collection": "notifications", "filter": {"recipient_id": s["user_id"]}, "sort": [("created_at", -1)], "limit": 100},
+        {"name": "notifications.get_unread_count", "collection": "notifications", "count": {"recipient_id": s["user_id"], "is_read": False}},
+        {"name": "notifications.delete_all", "collection": "notifications", "filter": {"recipient_id": s["user_id"]}},
+        # utils/device_tokens.py
+        {"name": "device_tokens.register", "collection": "device_tokens", "filter": {"token": "token-1"}, "limit": 1},
+        {"name": "device_tokens.live_tokens", "collection": "device_tokens", "filter": {"owner_id": s["user_id"], "last_seen_at": {"$gte": datetime.now(timezone.utc) - timedelta(days=60)}}, "projection": {"token": 1, "_id": 0}},
+        {"name": "device_tokens.delete", "collection": "device_tokens", "filter": {"token": {"$in": ["token-1", "token-2"]}}},
+        # utils/push_outbox.py
+        {"name": "push_outbox.claim", "collection": "push_outbox", "filter": {"status": {"$in": ["pending", "sending"]}, "next_attempt_at": {"$lte": datetime.now(timezone.utc)}}, "sort": [("next_attempt_at", 1)], "limit": 1},
+        {"name": "push_outbox.coalesce(merge)", "collection": "push_outbox", "filter": {"coalesce_key": f"{s['user_id']}:like:{s['post_id']}", "status": "pending", "attempts": 0}, "limit": 1},
+        {"name": "push_outbox.coalesce(recent)", "collection": "push_outbox", "filter": {"coalesce_key": f"{s['user_id']}:like:{s['post_id']}", "created_at": {"$gt": datetime.now(timezone.utc) - timedelta(seconds=30)}}, "limit": 1},
+        # routes/users.py
+        {"name": "users.signup(email)", "collection": "users", "filter": {"email": s["email"]}, "limit": 1},
+        {"name": "users.signup(username)", "collection": "users", "filter": {"username": s["username"]}, "limit": 1},
+        {"name": "users.get_all_users", "collection": "users", "filter": {"username": {"$nin": ["test", "fox"]}}, "sort": [("created_at", -1)], "limit": 50, "max_ratio": 1.5},
+    ]
+
+
+async def explain(db, shape: dict) -> dict:
+    if "count" in shape:
+        # count_documents는 $match + $group 집계로 실행됨
+        command = {
+            "aggregate": shape["collection"],
+            "pipeline": [{"$match": shape["count"]}, {"$group": {"_id": 1, "n": {"$sum": 1}}}],
+            "cursor": {},
+        }
+    elif "pipeline" in shape:
+        command = {"aggregate": shape["collection"], "pipeline": shape["pipeline"], "cursor": {}}
+    elif "distinct" in shape:
+        command = {"distinct": shape["collection"], "key": shape["distinct"], "query": shape["filter"]}
+    else:
+        command = {"find": shape["collection"], "filter": shape["filter"]}
+        if shape.get("sort"):
+            command["sort"] = dict(shape["sort"])
+        if shape.get("limit"):
+            command["limit"] = shape["limit"]
+        if shape.get("projection"):
+            command["projection"] = shape["projection"]
+    return await db.command({"explain": command, "verbosity": "executionStats"})
+
+
+def walk(node, found: dict):
+    """explain 결과 전체에서 stage 이름과 executionStats 수집"""
+    if isinstance(node, dict):
+        if isinstance(node.get("stage"), str):
+            found["stages"].add(node["stage"])
+        # $lookup 하위 파이프라인의 컬렉션 스캔 (MongoDB 5.0+ executionStats)
+        if node.get("collectionScans"):
+            found["stages"].add("COLLSCAN")
+        if "executionStats" in node and isinstance(node["executionStats"], dict):
+            found["stats"].append(node["executionStats"])
+        for value in node.values():
+            walk(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            walk(value, found)
+
+
+def check_plan(shape: dict, plan: dict, max_ratio: float) -> tuple[bool, str]:
+    found = {"stages": set(), "stats": []}
+    walk(plan, found)
+    examined = sum(stats.get("totalDocsExamined", 0) for stats in found["stats"])
+    returned = sum(stats.get("nReturned", 0) for stats in found["stats"])
+    ratio = examined / max(returned, 1)
+    detail = f"stages={sorted(found['stages'])} examined={examined} returned={returned}"
+
+    if "COLLSCAN" in found["stages"]:
+        return False, f"COLLSCAN {detail}"
+    limit = shape.get("max_ratio", max_ratio)
+    if ratio > limit:
+        return False, f"examined/returned {ratio:.1f} > {limit} {detail}"
+    return True, detail
+
+
+async def run(keep: bool, max_ratio: float) -> int:
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[PLAN_CHECK_DB]
+    failures = 0
+    try:
+        await client.drop_database(PLAN_CHECK_DB)
+        print(f"🌱 합성 데이터 시드 중... ({PLAN_CHECK_DB})")
+        sample = await seed(db)
+
+        print("=" * 70)
+        for shape in query_shapes(sample):
+            ok, detail = check_plan(shape, await explain(db, shape), max_ratio)
+            print(f"{'✅' if ok else '❌'} {shape['name']:40} {detail}")
+            failures += 0 if ok else 1
+        print("=" * 70)
+        print(f"실패: {failures}개" if failures else "모든 쿼리가 인덱스를 사용합니다.")
+    finally:
+        if not keep:
+            await client.drop_database(PLAN_CHECK_DB)
+        client.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keep", action="store_true", help="검사 후 임시 DB를 삭제하지 않음")
+    parser.add_argument("--max-ratio", type=float, default=3.0, help="반환 문서 대비 허용 조회 문서 비율")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.keep, args.max_ratio)))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+rate limit 저장소 점검 스크립트
+- RATE_LIMIT_STORAGE_URI(또는 --uri)로 utils/rate_limit.py와 같은 저장소/전략을 만들고
+- 저장소 연결 확인 후, 임시 키에 한도 + 1번 요청해 마지막 요청이 거부되는지 확인
+- redis:// 를 쓰려면 redis 패키지와 접속 가능한 Redis(또는 Valkey 등 호환 서버) 필요
+
+사용법:
+    python check_rate_limit_storage.py                                  # 설정된 저장소
+    python check_rate_limit_storage.py --uri redis://localhost:6379     # 다른 저장소 지정
+    python check_rate_limit_storage.py --uri memory:// --limit 5/minute
+"""
+import argparse
+import sys
+import uuid
+from dotenv import load_dotenv
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+load_dotenv()
+
+from utils.rate_limit import RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY
+
+
+def check_storage(uri: str, strategy: str, limit_value: str) -> int:
+    print("=" * 60)
+    print(f"🔌 저장소: {uri} (전략: {strategy})")
+    try:
+        storage = storage_from_string(uri)
+    except Exception as e:
+        print(f"❌ 저장소를 만들 수 없습니다: {e}")
+        return 1
+    if not storage.check():
+        print("❌ 저장소에 연결할 수 없습니다 (서버에서는 프로세스 메모리 카운터로 대체됨)")
+        return 1
+
+    limiter = STRATEGIES[strategy](storage)
+    item = parse(limit_value)
+    key = f"check-{uuid.uuid4().hex}"
+    try:
+        results = [limiter.hit(item, key) for _ in range(item.amount + 1)]
+    finally:
+        limiter.clear(item, key)
+
+    allowed = sum(results[:-1])
+    print(f"  한도 {limit_value}: {item.amount}번 중 {allowed}번 허용, {item.amount + 1}번째 요청 {'허용' if results[-1] else '거부'}")
+    if allowed != item.amount or results[-1]:
+        print("❌ rate limit이 예상대로 동작하지 않습니다")
+        return 1
+    print("✅ rate limit 저장소가 정상 동작합니다")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=RATE_LIMIT_STORAGE_URI)
+    parser.add_argument("--strategy", default=RATE_LIMIT_STRATEGY, choices=sorted(STRATEGIES))
+    parser.add_argument("--limit", default="3/minute")
+    args = parser.parse_args()
+    sys.exit(check_storage(args.uri, args.strategy, args.limit))
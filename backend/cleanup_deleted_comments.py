@@ -2,6 +2,7 @@ import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import os
+from utils.comment_sweeper import sweep_deleted_comments
 
 load_dotenv()
 
@@ -12,20 +13,14 @@ async def cleanup_deleted_comments():
     client = AsyncIOMotorClient(MONGODB_URL)
     db = client[DATABASE_NAME]
     
-    # is_deleted=true인 댓글 찾기
-    deleted_comments = await db.comments.find({"is_deleted": True}).to_list(length=1000)
-    
+    # 자식이 없는 soft delete 댓글을 배치 단위로 삭제
     deleted_count = 0
-    for comment in deleted_comments:
-        comment_id = str(comment["_id"])
-        # 자식 댓글이 있는지 확인
-        child_count = await db.comments.count_documents({"parent_id": comment_id})
-        
-        if child_count == 0:
-            # 자식이 없으면 삭제
-            await db.comments.delete_one({"_id": comment["_id"]})
-            deleted_count += 1
-            print(f"삭제됨: {comment_id}")
+    while True:
+        deleted = await sweep_deleted_comments(db)
+        if not deleted:
+            break
+        deleted_count += deleted
+        print(f"삭제됨: {deleted}개")
     
     print(f"\n총 {deleted_count}개의 댓글이 삭제되었습니다.")
     client.close()
@@ -2,8 +2,7 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 import os
 import sys
@@ -20,8 +19,17 @@ from routes.posts import router as posts_router
 from routes.uploads import router as uploads_router
 from routes.profiles import router as profiles_router
 from routes.notifications import router as notifications_router
+from utils.background import WORKER_ID, run_periodically, start_background_task, stop_background_tasks
+from utils.post_counters import POST_COUNTER_RECONCILE_SECONDS, run_post_counter_reconcile
+from utils.indexes import ensure_indexes
+from utils.comment_sweeper import COMMENT_SWEEP_INTERVAL_SECONDS, run_comment_sweep
+from utils.push_outbox import push_outbox
+from utils.metrics import METRICS_LOG_INTERVAL_SECONDS, log_stats
+from utils.rate_limit import limiter
+
+# 시작 시 인덱스 생성: background(시작을 막지 않음) / blocking(완료 후 요청 처리) / off
+INDEX_BUILD_MODE = os.getenv("INDEX_BUILD_MODE", "background")
 
-limiter = Limiter(key_func=get_remote_address)
 app = FastAPI(title="SNS API")
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -48,6 +56,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.on_event("startup")
@@ -60,8 +69,36 @@ async def startup_db_client():
     app.mongodb = app.mongodb_client[db_name]
     print("MongoDB connected!")
 
+    if INDEX_BUILD_MODE == "blocking":
+        await ensure_indexes(app.mongodb, background=False)
+    elif INDEX_BUILD_MODE == "background":
+        start_background_task(app, ensure_indexes(app.mongodb, background=True))
+
+    # 게시글 카운터 드리프트 보정 (시작 시 한 번, 이후 주기적, lease를 얻은 워커 하나만 실행)
+    start_background_task(app, run_periodically(
+        "reconcile_post_counters",
+        POST_COUNTER_RECONCILE_SECONDS,
+        lambda: run_post_counter_reconcile(app.mongodb, WORKER_ID),
+        run_first=True,
+    ))
+    # 대댓글 없는 soft delete 댓글 정리 (lease를 얻은 워커 하나만 실행)
+    start_background_task(app, run_periodically(
+        "sweep_deleted_comments",
+        COMMENT_SWEEP_INTERVAL_SECONDS,
+        lambda: run_comment_sweep(app.mongodb, WORKER_ID),
+    ))
+    # 푸시 알림 outbox 전송 워커
+    push_outbox.start(app.mongodb, WORKER_ID)
+    # 프로세스 내 카운터(utils/metrics.py)를 주기적으로 로그에 기록
+    if METRICS_LOG_INTERVAL_SECONDS > 0:
+        start_background_task(app, run_periodically("log_stats", METRICS_LOG_INTERVAL_SECONDS, log_stats))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # 전송 중인 푸시 알림을 마무리한 뒤 종료
+    await push_outbox.stop()
+    await stop_background_tasks(app)
+    await log_stats()
     app.mongodb_client.close()
 
 app.include_router(users_router)  # 수정
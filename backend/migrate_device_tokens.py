@@ -0,0 +1,83 @@
+"""
+users.device_tokens 배열을 device_tokens 컬렉션으로 옮기는 마이그레이션
+- device_tokens: {token, owner_id, platform, created_at, last_seen_at} + token unique 인덱스
+- 같은 토큰이 여러 사용자에게 있으면 마지막으로 처리한 사용자가 소유자가 됨
+- last_seen_at은 마이그레이션 시각 (이후 DEVICE_TOKEN_TTL_DAYS 동안 재등록이 없으면 만료)
+
+여러 번 실행해도 안전합니다. --unset 옵션을 주면 옮긴 뒤 users.device_tokens 배열을 삭제합니다.
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
+
+from utils.indexes import index_models
+
+MONGO_URI = os.getenv("MONGO_URI") or os.getenv("MONGODB_URL")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "sns_db")
+BATCH_SIZE = 500
+
+if not MONGO_URI:
+    raise ValueError("MONGO_URI environment variable is not set!")
+
+
+def migrate_batch(db, users: list) -> int:
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {"token": token},
+            {
+                "$set": {"owner_id": str(user["_id"]), "last_seen_at": now},
+                "$setOnInsert": {"platform": None, "created_at": now},
+            },
+            upsert=True,
+        )
+        for user in users
+        for token in user.get("device_tokens", [])
+        if token
+    ]
+    if ops:
+        db.device_tokens.bulk_write(ops, ordered=True)
+    return len(ops)
+
+
+def main() -> None:
+    unset = "--unset" in sys.argv
+    client = MongoClient(MONGO_URI)
+    db = client[DATABASE_NAME]
+
+    db.device_tokens.create_indexes(index_models("device_tokens"))
+
+    cursor = db.users.find({"device_tokens.0": {"$exists": True}}, {"device_tokens": 1}).sort("_id", 1).batch_size(BATCH_SIZE)
+
+    total_users = 0
+    total_tokens = 0
+    batch = []
+    for user in cursor:
+        batch.append(user)
+        if len(batch) == BATCH_SIZE:
+            total_tokens += migrate_batch(db, batch)
+            total_users += len(batch)
+            print(f"users: migrated {total_users} documents")
+            batch = []
+    if batch:
+        total_tokens += migrate_batch(db, batch)
+        total_users += len(batch)
+
+    distinct_tokens = db.device_tokens.estimated_document_count()
+    print(f"Total migrated users: {total_users}, tokens: {total_tokens} (device_tokens collection: {distinct_tokens})")
+
+    if unset:
+        result = db.users.update_many({"device_tokens": {"$exists": True}}, {"$unset": {"device_tokens": ""}})
+        print(f"Removed users.device_tokens from {result.modified_count} users")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
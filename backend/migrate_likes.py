@@ -0,0 +1,99 @@
+"""
+posts.liked_by 배열을 likes 컬렉션으로 옮기는 마이그레이션
+- likes: {post_id, user_id, created_at} + (post_id, user_id) unique 인덱스
+- posts.likes_count: likes 컬렉션 기준 개수로 설정
+- posts.liked_by: 최근 좋아요 누른 사용자 일부만 남김
+
+여러 번 실행해도 안전합니다. 기본은 likes_count가 없는 게시글만 처리하고,
+--all 옵션을 주면 모든 게시글의 카운터를 다시 계산합니다.
+(마이그레이션 전 게시글은 처음 좋아요/취소될 때 utils/likes.py의 migrate_post_likes로 하나씩 옮겨짐)
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
+
+from utils.likes import LIKED_BY_PREVIEW_SIZE
+from utils.indexes import index_models
+
+MONGO_URI = os.getenv("MONGO_URI") or os.getenv("MONGODB_URL")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "sns_db")
+BATCH_SIZE = 500
+
+if not MONGO_URI:
+    raise ValueError("MONGO_URI environment variable is not set!")
+
+
+def migrate_batch(db, posts: list) -> int:
+    now = datetime.now(timezone.utc)
+    like_ops = [
+        UpdateOne(
+            {"post_id": str(post["_id"]), "user_id": user_id},
+            {"$setOnInsert": {"created_at": now}},
+            upsert=True,
+        )
+        for post in posts
+        for user_id in post.get("liked_by", [])
+    ]
+    if like_ops:
+        db.likes.bulk_write(like_ops, ordered=False)
+
+    post_ids = [str(post["_id"]) for post in posts]
+    counts = {
+        row["_id"]: row["count"]
+        for row in db.likes.aggregate([
+            {"$match": {"post_id": {"$in": post_ids}}},
+            {"$group": {"_id": "$post_id", "count": {"$sum": 1}}},
+        ])
+    }
+
+    post_ops = [
+        UpdateOne(
+            {"_id": post["_id"]},
+            {"$set": {
+                "likes_count": counts.get(str(post["_id"]), 0),
+                "liked_by": post.get("liked_by", [])[-LIKED_BY_PREVIEW_SIZE:],
+            }},
+        )
+        for post in posts
+    ]
+    db.posts.bulk_write(post_ops, ordered=False)
+    return len(like_ops)
+
+
+def main() -> None:
+    recount_all = "--all" in sys.argv
+    client = MongoClient(MONGO_URI)
+    db = client[DATABASE_NAME]
+
+    db.likes.create_indexes(index_models("likes"))
+
+    query = {} if recount_all else {"likes_count": {"$exists": False}}
+    cursor = db.posts.find(query, {"liked_by": 1}).batch_size(BATCH_SIZE)
+
+    total_posts = 0
+    total_likes = 0
+    batch = []
+    for post in cursor:
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            total_likes += migrate_batch(db, batch)
+            total_posts += len(batch)
+            print(f"posts: migrated {total_posts} documents")
+            batch = []
+    if batch:
+        total_likes += migrate_batch(db, batch)
+        total_posts += len(batch)
+
+    print(f"Total migrated posts: {total_posts}, likes: {total_likes}")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # 댓글 생성 요청
@@ -28,3 +28,9 @@ class CommentResponse(BaseModel):
     is_deleted: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+# 스레드형 댓글 응답 (최상위 댓글 + 대댓글 일부)
+class CommentThreadResponse(CommentResponse):
+    reply_count: int = 0
+    replies: List[CommentResponse] = Field(default_factory=list)
+    replies_next_cursor: Optional[str] = None
@@ -26,6 +26,7 @@ class PostResponse(BaseModel):
     category: str = "전체"
     image_url: Optional[str] = None
     likes_count: int
-    liked_by: List[str] = Field(default_factory=list)
+    liked_by: List[str] = Field(default_factory=list, description="최근 좋아요 누른 사용자 일부 (전체 목록 아님)")
     created_at: datetime
     updated_at: Optional[datetime] = None
+    liked_by_me: Optional[bool] = None  # 로그인한 사용자의 좋아요 여부 (비로그인 시 None)
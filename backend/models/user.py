@@ -41,4 +41,5 @@ class Token(BaseModel):
 
 # 디바이스 토큰 저장 요청
 class DeviceTokenRequest(BaseModel):
-    device_token: str
\ No newline at end of file
+    device_token: str
+    platform: Optional[str] = None  # android / ios / web
\ No newline at end of file
@@ -0,0 +1,25 @@
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+from utils.post_counters import reconcile_post_counters
+
+load_dotenv()
+
+MONGODB_URL = os.getenv("MONGO_URI") or os.getenv("MONGODB_URL")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "sns_db")
+
+async def main():
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[DATABASE_NAME]
+    try:
+        before = await db.counters.find_one({"_id": "posts"}) or {}
+        after = await reconcile_post_counters(db)
+        print(f"전체: {before.get('total')} → {after['total']}")
+        for category, count in sorted(after["by_category"].items()):
+            print(f"  - {category}: {before.get('by_category', {}).get(category)} → {count}")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
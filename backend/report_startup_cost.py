@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+콜드 스타트 비용 리포트
+- `python -X importtime -c "import main"`으로 main:app import 비용을 모듈별로 측정
+- 지연 초기화하는 SDK(Firebase, Cloudinary)의 초기화 비용을 따로 측정
+- import 합계가 예산을 넘으면 실패 (exit code 1)
+
+사용법:
+    python report_startup_cost.py [--budget-ms 1500] [--top 15] [--skip-init]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PACKAGES = ("main", "routes", "utils", "models")
+
+
+def measure_imports() -> list[tuple[str, int, int, int]]:
+    """(모듈, self us, cumulative us, 깊이) 목록"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit("❌ main import 실패")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure_init() -> dict[str, float]:
+    sys.path.insert(0, BASE_DIR)
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
+    from utils.startup_timing import init_costs
+    from utils.push_transport import init_firebase
+    from utils.cloudinary import configure_cloudinary
+
+    init_firebase()
+    configure_cloudinary()
+    return dict(init_costs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=1500, help="main:app import 예산 (ms)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--skip-init", action="store_true", help="SDK 초기화 비용은 측정하지 않음")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = measure_imports()
+    wall_ms = (time.perf_counter() - started) * 1000
+    total_ms = next(cumulative for name, _, cumulative, _ in rows if name == "main") / 1000
+
+    app_rows = [row for row in rows if row[0].split(".")[0] in APP_PACKAGES]
+    # 서드파티는 최상위 패키지가 처음 import될 때의 누적 비용
+    third_party = {}
+    for name, _, cumulative, _ in rows:
+        root = name.split(".")[0]
+        if root not in APP_PACKAGES and name == root:
+            third_party[root] = max(third_party.get(root, 0), cumulative)
+
+    print("=" * 60)
+    print("📦 앱 모듈 import 비용 (누적, 하위 import 포함)")
+    print("=" * 60)
+    for name, _, cumulative, _ in sorted(app_rows, key=lambda row: -row[2])[:args.top]:
+        print(f"  {name:36} {cumulative / 1000:8.1f} ms")
+
+    print("\n" + "=" * 60)
+    print("📚 서드파티 패키지 import 비용 (처음 import한 시점 기준)")
+    print("=" * 60)
+    for name, cumulative in sorted(third_party.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:36} {cumulative / 1000:8.1f} ms")
+
+    if not args.skip_init:
+        print("\n" + "=" * 60)
+        print("🔌 지연 초기화 SDK (첫 사용 시 비용, 시작 시에는 발생하지 않음)")
+        print("=" * 60)
+        for name, ms in measure_init().items():
+            print(f"  {name:36} {ms:8.1f} ms")
+
+    print("\n" + "=" * 60)
+    print(f"main:app import 합계: {total_ms:.1f} ms (프로세스 포함 {wall_ms:.0f} ms), 예산 {args.budget_ms:.0f} ms")
+    if total_ms > args.budget_ms:
+        print("❌ 예산 초과")
+        sys.exit(1)
+    print("✅ 예산 이내")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,10 @@ from fastapi import APIRouter, HTTPException, Depends, status, Request
 from models.notification import NotificationCreate, NotificationResponse, NotificationUpdate
 from utils.auth import get_current_user
 from utils.database import get_db, parse_object_id
+from utils.user_loader import get_user_loader
+from utils.fast_json import model_list_response
 from datetime import datetime, timezone
 from typing import Optional
-from bson import ObjectId
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 
@@ -35,9 +36,7 @@ async def get_notifications(request: Request, user_id: str = Depends(get_current
     cursor = db.notifications.find({"recipient_id": user_id}).sort("created_at", -1)
     notifications = await cursor.to_list(length=100)
 
-    actor_ids = list({n.get("actor_id") for n in notifications if n.get("actor_id")})
-    actors = await db.users.find({"_id": {"$in": [ObjectId(aid) for aid in actor_ids]}}).to_list(length=200)
-    actor_map = {str(actor["_id"]): actor for actor in actors}
+    actor_map = await get_user_loader(request).load_many(n.get("actor_id") for n in notifications)
 
     responses = []
     for n in notifications:
@@ -49,7 +48,7 @@ async def get_notifications(request: Request, user_id: str = Depends(get_current
                 "actor_display_name": actor.get("display_name", n.get("actor_display_name", "")),
             }
         responses.append(build_notification_response(n))
-    return responses
+    return model_list_response(responses)
 
 @router.get("/unread/count")
 async def get_unread_count(request: Request, user_id: str = Depends(get_current_user)):
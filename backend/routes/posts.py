@@ -1,108 +1,108 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Request
+from fastapi import APIRouter, HTTPException, Depends, status, Request, Response
+from fastapi.responses import JSONResponse
 from models.post import PostCreate, PostUpdate, PostResponse
-from models.comment import CommentCreate, CommentUpdate, CommentResponse
-from utils.auth import get_current_user
+from models.comment import CommentCreate, CommentUpdate, CommentResponse, CommentThreadResponse
+from utils.auth import get_current_user, get_optional_current_user
 from utils.database import get_db, parse_object_id
+from utils.user_loader import UserLoader, get_current_user_card, get_user_loader
+from utils.pagination import NEWEST_FIRST, OLDEST_FIRST, NEXT_CURSOR_HEADER, encode_cursor, keyset_filter, next_cursor
+from utils.feed_cache import feed_cache
+from utils.likes import add_like, remove_like, delete_post_likes, liked_post_ids, likes_count
+from utils.fast_json import model_list_response
+from utils.fields import parse_fields, build_projection, needs_author, dump_selected
+from utils.post_counters import increment_post_count, move_post_category, get_post_count
 from datetime import datetime, timezone
 from typing import Optional
-from bson import ObjectId
-from utils.push_notification import send_push_notification, PushNotificationError
+from utils.push_outbox import enqueue_push
+from utils.rate_limit import POST_CREATE_RATE_LIMIT, POST_LIKE_RATE_LIMIT, limiter, user_or_ip_key
 
 router = APIRouter(prefix="/api/posts", tags=["Posts"])
 
-async def remove_invalid_token(user_id: str, invalid_token: str, db):
-    """무효한 토큰을 device_tokens 배열에서 제거"""
-    try:
-        await db.users.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$pull": {"device_tokens": invalid_token}}
-        )
-        print(f"  ✅ 사용자 {user_id}의 무효 토큰 제거됨")
-    except Exception as e:
-        print(f"  ❌ 토큰 제거 실패: {e}")
+# fields= 사용 시에도 응답 생성/커서에 항상 필요한 문서 필드
+POST_BASE_FIELDS = ["_id", "author_id", "created_at"]
+COMMENT_BASE_FIELDS = ["_id", "post_id", "parent_id", "author_id", "created_at"]
 
 def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
     if dt is None:
         return None
     return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
 
-async def build_post_response(post, db=None) -> PostResponse:
-    liked_by = post.get("liked_by", [])
-    author_profile_image = post.get("author_profile_image")
-    author_display_name_color = post.get("author_display_name_color", "#000000")
-    author_username = post.get("author_username", "")
-    author_display_name = post.get("author_display_name", "")
-    
-    # 항상 최신 사용자 정보 조회 (색상 변경 반영)
-    if db is not None and post.get("author_id"):
-        try:
-            user = await db.users.find_one({"_id": ObjectId(post["author_id"])})
-            if user:
-                author_username = user.get("username", author_username)
-                author_display_name = user.get("display_name", author_display_name)
-                if user.get("profile_image"):
-                    author_profile_image = user.get("profile_image")
-                author_display_name_color = user.get("display_name_color", "#000000")
-        except:
-            pass
-    
-    return PostResponse(
-        id=str(post["_id"]),
-        author_id=post["author_id"],
-        author_username=author_username,
-        author_display_name=author_display_name,
-        author_display_name_color=author_display_name_color,
-        author_profile_image=author_profile_image,
-        content=post.get("content", ""),
-        image_url=post.get("image_url"),
-        category=post.get("category", "전체"),
-        likes_count=len(liked_by),
-        liked_by=liked_by,
-        created_at=ensure_utc(post["created_at"]),
-        updated_at=ensure_utc(post.get("updated_at")),
-    )
-
-async def build_comment_response(comment, db=None) -> CommentResponse:
-    author_profile_image = comment.get("author_profile_image")
-    author_display_name_color = comment.get("author_display_name_color", "#000000")
-    author_username = comment.get("author_username", "")
-    author_display_name = comment.get("author_display_name", "")
-    
-    # 항상 최신 사용자 정보 조회 (색상 변경 반영)
-    if db is not None and comment.get("author_id"):
-        try:
-            user = await db.users.find_one({"_id": ObjectId(comment["author_id"])})
-            if user:
-                author_username = user.get("username", author_username)
-                author_display_name = user.get("display_name", author_display_name)
-                if user.get("profile_image"):
-                    author_profile_image = user.get("profile_image")
-                author_display_name_color = user.get("display_name_color", "#000000")
-        except:
-            pass
-    
-    return CommentResponse(
-        id=str(comment["_id"]),
-        post_id=comment["post_id"],
-        parent_id=comment.get("parent_id"),
-        author_id=comment["author_id"],
-        author_username=author_username,
-        author_display_name=author_display_name,
-        author_display_name_color=author_display_name_color,
-        author_profile_image=author_profile_image,
-        content=comment.get("content", ""),
-        image_url=comment.get("image_url"),
-        is_deleted=comment.get("is_deleted", False),
-        created_at=ensure_utc(comment["created_at"]),
-        updated_at=ensure_utc(comment.get("updated_at")),
-    )
-
+def apply_author(doc, author: Optional[dict]) -> dict:
+    """문서에 저장된 작성자 정보를 최신 사용자 정보로 덮어쓴 값 반환 (색상 변경 반영)"""
+    fields = {
+        "author_username": doc.get("author_username", ""),
+        "author_display_name": doc.get("author_display_name", ""),
+        "author_display_name_color": doc.get("author_display_name_color", "#000000"),
+        "author_profile_image": doc.get("author_profile_image"),
+    }
+    if author:
+        fields["author_username"] = author.get("username", fields["author_username"])
+        fields["author_display_name"] = author.get("display_name", fields["author_display_name"])
+        if author.get("profile_image"):
+            fields["author_profile_image"] = author.get("profile_image")
+        fields["author_display_name_color"] = author.get("display_name_color", "#000000")
+    return fields
+
+async def build_post_response(post, loader: Optional[UserLoader] = None, liked_ids: Optional[set] = None) -> PostResponse:
+    return (await build_post_responses([post], loader, liked_ids))[0]
+
+async def build_post_responses(posts, loader: Optional[UserLoader] = None, liked_ids: Optional[set] = None) -> list[PostResponse]:
+    if loader is not None:
+        await loader.load_many(post.get("author_id") for post in posts)
+
+    responses = []
+    for post in posts:
+        liked_by = post.get("liked_by", [])
+        author = loader.get(post.get("author_id")) if loader is not None else None
+        responses.append(PostResponse(
+            id=str(post["_id"]),
+            author_id=post["author_id"],
+            **apply_author(post, author),
+            content=post.get("content", ""),
+            image_url=post.get("image_url"),
+            category=post.get("category", "전체"),
+            likes_count=likes_count(post),
+            liked_by=liked_by,
+            created_at=ensure_utc(post["created_at"]),
+            updated_at=ensure_utc(post.get("updated_at")),
+            liked_by_me=str(post["_id"]) in liked_ids if liked_ids is not None else None,
+        ))
+    return responses
+
+async def build_comment_response(comment, loader: Optional[UserLoader] = None) -> CommentResponse:
+    return (await build_comment_responses([comment], loader))[0]
+
+async def build_comment_responses(comments, loader: Optional[UserLoader] = None) -> list[CommentResponse]:
+    if loader is not None:
+        await loader.load_many(comment.get("author_id") for comment in comments)
+
+    responses = []
+    for comment in comments:
+        author = loader.get(comment.get("author_id")) if loader is not None else None
+        responses.append(CommentResponse(
+            id=str(comment["_id"]),
+            post_id=comment["post_id"],
+            parent_id=comment.get("parent_id"),
+            author_id=comment["author_id"],
+            **apply_author(comment, author),
+            content=comment.get("content", ""),
+            image_url=comment.get("image_url"),
+            is_deleted=comment.get("is_deleted", False),
+            created_at=ensure_utc(comment["created_at"]),
+            updated_at=ensure_utc(comment.get("updated_at")),
+        ))
+    return responses
+
+# 게시글 작성 — 사용자당 POST_CREATE_RATE_LIMIT
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
-async def create_post(payload: PostCreate, request: Request, user_id: str = Depends(get_current_user)):
+@limiter.limit(POST_CREATE_RATE_LIMIT, key_func=user_or_ip_key)
+async def create_post(
+    payload: PostCreate,
+    request: Request,
+    user_id: str = Depends(get_current_user),
+    user: dict = Depends(get_current_user_card),
+):
     db = get_db(request)
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
     content = (payload.content or "").strip()
     if content == "" and not payload.image_url:
@@ -123,6 +123,7 @@ async def create_post(payload: PostCreate, request: Request, user_id: str = Depe
         "image_url": payload.image_url,
         "category": category,
         "liked_by": [],
+        "likes_count": 0,
         "created_at": datetime.now(timezone.utc),
         "updated_at": None,
     }
@@ -130,39 +131,85 @@ async def create_post(payload: PostCreate, request: Request, user_id: str = Depe
     result = await db.posts.insert_one(post_doc)
     post_doc["_id"] = result.inserted_id
 
-    return await build_post_response(post_doc, db)
+    await increment_post_count(db, category)
+    await feed_cache.invalidate_for_post(db, category)
+
+    # 작성자 카드는 get_current_user_card가 이미 UserLoader에 올려 둠
+    return await build_post_response(post_doc, get_user_loader(request))
 
 @router.get("/", response_model=list[PostResponse])
-async def list_posts(request: Request, page: int = 1, limit: int = 50, category: str = None):
+async def list_posts(
+    request: Request,
+    response: Response,
+    page: int = 1,
+    limit: int = 50,
+    category: str = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    viewer_id: Optional[str] = Depends(get_optional_current_user),
+):
     db = get_db(request)
     limit = min(max(limit, 1), 100)
     page = max(page, 1)
-    skip = (page - 1) * limit
+    selected = parse_fields(fields, PostResponse.model_fields)
     
     # 카테고리 필터링
     query = {}
     if category and category != "전체":
         query["category"] = category
     
-    cursor = db.posts.find(query).sort("created_at", -1).skip(skip).limit(limit)
-    posts = await cursor.to_list(length=limit)
-
-    return [await build_post_response(post, db) for post in posts]
+    # 카테고리별 첫 페이지는 미리 직렬화된 캐시에서 바로 응답
+    cache_key = feed_cache.key_for(category)
+    if not cursor and page == 1 and cache_key and limit <= feed_cache.size and selected is None:
+        async def build_first_page(size: int):
+            posts = await db.posts.find(query).sort(NEWEST_FIRST).limit(size).to_list(length=size)
+            return posts, await build_post_responses(posts, get_user_loader(request))
+
+        feed_page = await feed_cache.get_or_build(db, cache_key, build_first_page)
+        liked_ids = await liked_post_ids(db, viewer_id, feed_page.post_ids[:limit])
+        body, cursor_value = feed_page.render(limit, liked_ids)
+        headers = {NEXT_CURSOR_HEADER: cursor_value} if cursor_value else None
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    projection = build_projection(selected, POST_BASE_FIELDS)
+    if cursor:
+        # 커서 모드: (created_at, _id) 키셋으로 이어서 조회 (skip 없음)
+        query.update(keyset_filter(cursor))
+        db_cursor = db.posts.find(query, projection).sort(NEWEST_FIRST).limit(limit)
+    else:
+        skip = (page - 1) * limit
+        db_cursor = db.posts.find(query, projection).sort(NEWEST_FIRST).skip(skip).limit(limit)
+    posts = await db_cursor.to_list(length=limit)
+
+    cursor_value = next_cursor(posts, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+
+    liked_ids = None
+    if selected is None or "liked_by_me" in selected:
+        liked_ids = await liked_post_ids(db, viewer_id, [str(post["_id"]) for post in posts])
+    loader = get_user_loader(request) if needs_author(selected) else None
+    responses = await build_post_responses(posts, loader, liked_ids)
+    headers = {NEXT_CURSOR_HEADER: cursor_value} if cursor_value else None
+    if selected is not None:
+        return JSONResponse(content=dump_selected(responses, selected), headers=headers)
+    return model_list_response(responses, headers)
 
 @router.get("/meta/count")
-async def get_posts_count(request: Request):
+async def get_posts_count(request: Request, category: Optional[str] = None):
     db = get_db(request)
-    count = await db.posts.count_documents({})
+    count = await get_post_count(db, category)
     return {"total": count}
 
 @router.get("/{post_id}", response_model=PostResponse)
-async def get_post(post_id: str, request: Request):
+async def get_post(post_id: str, request: Request, viewer_id: Optional[str] = Depends(get_optional_current_user)):
     db = get_db(request)
     post = await db.posts.find_one({"_id": parse_object_id(post_id)})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    return await build_post_response(post, db)
+    liked_ids = await liked_post_ids(db, viewer_id, [str(post["_id"])])
+    return await build_post_response(post, get_user_loader(request), liked_ids)
 
 @router.put("/{post_id}", response_model=PostResponse)
 async def update_post(post_id: str, payload: PostUpdate, request: Request, user_id: str = Depends(get_current_user)):
@@ -202,11 +249,20 @@ async def update_post(post_id: str, payload: PostUpdate, request: Request, user_
         post["content"] = content
     if payload.image_url is not None:
         post["image_url"] = payload.image_url
+    previous_category = post.get("category", "전체")
     if payload.category is not None:
         post["category"] = payload.category
     post["updated_at"] = updated_at
 
-    return await build_post_response(post, db)
+    liked_ids = await liked_post_ids(db, user_id, [str(post["_id"])])
+    response = await build_post_response(post, get_user_loader(request), liked_ids)
+    if post.get("category", "전체") != previous_category:
+        await move_post_category(db, previous_category, post["category"])
+        await feed_cache.invalidate_for_post(db, previous_category)
+        await feed_cache.invalidate_for_post(db, post["category"])
+    else:
+        await feed_cache.update_post(db, response)
+    return response
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post(post_id: str, request: Request, user_id: str = Depends(get_current_user)):
@@ -218,28 +274,33 @@ async def delete_post(post_id: str, request: Request, user_id: str = Depends(get
     if post["author_id"] != user_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    await db.posts.delete_one({"_id": post["_id"]})
+    result = await db.posts.delete_one({"_id": post["_id"]})
+    if result.deleted_count:
+        await increment_post_count(db, post.get("category"), -1)
+    await delete_post_likes(db, str(post["_id"]))
+    await feed_cache.remove_post(db, post.get("category"))
     return None
 
+# 좋아요 — 사용자당 POST_LIKE_RATE_LIMIT (게시글과 상관없이 합산)
 @router.post("/{post_id}/like", response_model=PostResponse)
-async def like_post(post_id: str, request: Request, user_id: str = Depends(get_current_user)):
+@limiter.limit(POST_LIKE_RATE_LIMIT, key_func=user_or_ip_key)
+async def like_post(
+    post_id: str,
+    request: Request,
+    user_id: str = Depends(get_current_user),
+    user: dict = Depends(get_current_user_card),
+):
     db = get_db(request)
     post = await db.posts.find_one({"_id": parse_object_id(post_id)})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    # 이미 좋아요 했는지 확인
-    already_liked = user_id in post.get("liked_by", [])
-
-    await db.posts.update_one(
-        {"_id": post["_id"]},
-        {"$addToSet": {"liked_by": user_id}},
-    )
+    # 이미 좋아요 했으면 False
+    already_liked = not await add_like(db, post["_id"], user_id)
 
     # 처음 좋아요 한 경우만 알림 생성 및 푸시 알림 전송
     if not already_liked and post["author_id"] != user_id:
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        await db.notifications.insert_one({
+        notification = await db.notifications.insert_one({
             "recipient_id": post["author_id"],
             "actor_id": user_id,
             "actor_username": user["username"],
@@ -253,33 +314,23 @@ async def like_post(post_id: str, request: Request, user_id: str = Depends(get_c
             "updated_at": None,
         })
 
-        # 푸시 알림 전송
-        author = await db.users.find_one({"_id": ObjectId(post["author_id"])})
-        device_tokens = author.get("device_tokens", []) if author else []
-        if device_tokens:
-            try:
-                print(f"\n📤 좋아요 푸시 알림 발송 시도")
-                print(f"  수신자: {author.get('email')}")
-                print(f"  토큰 수: {len(device_tokens)}")
-                
-                async def handle_invalid_token(token: str):
-                    await remove_invalid_token(str(author["_id"]), token, db)
-                
-                result = await send_push_notification(
-                    device_tokens,
-                    "새 좋아요 ❤️",
-                    f"{user['display_name']}님이 좋아요를 눌렀습니다",
-                    on_invalid_token=handle_invalid_token
-                )
-                print(f"  결과: {result}\n")
-            except Exception as e:
-                print(f"\n❌ 좋아요 푸시 알림 발송 실패: {e}\n")
-        else:
-            print(f"\n⚠️ 좋아요 알림 미발송: 대상 유저 또는 token 없음\n")
-
+        # 푸시 알림은 outbox에 저장하고 워커가 전송
+        await enqueue_push(
+            db,
+            post["author_id"],
+            "새 좋아요 ❤️",
+            f"{user['display_name']}님이 좋아요를 눌렀습니다",
+            notification_type="like",
+            post_id=post_id,
+            actor_id=user_id,
+            actor_name=user["display_name"],
+            notification_id=notification.inserted_id,
+        )
 
     post = await db.posts.find_one({"_id": post["_id"]})
-    return await build_post_response(post, db)
+    response = await build_post_response(post, get_user_loader(request), {str(post["_id"])})
+    await feed_cache.update_post(db, response)
+    return response
 
 @router.delete("/{post_id}/like", response_model=PostResponse)
 async def unlike_post(post_id: str, request: Request, user_id: str = Depends(get_current_user)):
@@ -288,49 +339,150 @@ async def unlike_post(post_id: str, request: Request, user_id: str = Depends(get
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    await db.posts.update_one(
-        {"_id": post["_id"]},
-        {"$pull": {"liked_by": user_id}},
-    )
+    await remove_like(db, post["_id"], user_id)
 
     post = await db.posts.find_one({"_id": post["_id"]})
-    return await build_post_response(post, db)
+    response = await build_post_response(post, get_user_loader(request), set())
+    await feed_cache.update_post(db, response)
+    return response
 
 @router.get("/{post_id}/comments", response_model=list[CommentResponse])
-async def list_comments(post_id: str, request: Request):
+async def list_comments(post_id: str, request: Request, fields: Optional[str] = None):
     db = get_db(request)
-    post = await db.posts.find_one({"_id": parse_object_id(post_id)})
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
+    selected = parse_fields(fields, CommentResponse.model_fields)
+    post_oid = parse_object_id(post_id)
 
-    cursor = db.comments.find({"post_id": post_id}).sort("created_at", 1)
+    # soft delete 댓글 정리는 백그라운드 작업(utils/comment_sweeper.py)에서 처리
+    projection = build_projection(selected, COMMENT_BASE_FIELDS + ["is_deleted"])
+    cursor = db.comments.find({"post_id": post_id}, projection).sort("created_at", 1)
     comments = await cursor.to_list(length=500)
-    
-    # soft delete된 댓글 중 자식이 없는 것들 삭제
-    for comment in comments:
-        if comment.get("is_deleted") and comment.get("parent_id") is None:
-            # 부모가 soft delete 상태이고 자식이 있는지 확인
-            child_count = await db.comments.count_documents({"parent_id": str(comment["_id"])})
-            if child_count == 0:
-                # 자식이 없으면 완전 삭제
-                await db.comments.delete_one({"_id": comment["_id"]})
-    
-    # 다시 조회해서 반환
-    cursor = db.comments.find({"post_id": post_id}).sort("created_at", 1)
-    comments = await cursor.to_list(length=500)
-    return [await build_comment_response(comment, db) for comment in comments]
+
+    # 댓글이 없을 때만 게시글 존재 여부 확인 (404)
+    if not comments and not await db.posts.find_one({"_id": post_oid}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    # 아직 정리되지 않은, 대댓글 없는 soft delete 댓글은 응답에서 제외
+    # (대댓글이 500개 범위 밖에 있을 수 있으므로 대댓글 존재 여부는 따로 조회)
+    deleted_ids = [
+        str(comment["_id"]) for comment in comments
+        if comment.get("is_deleted") and comment.get("parent_id") is None
+    ]
+    if deleted_ids:
+        reply_parents = set(await db.comments.distinct("parent_id", {"parent_id": {"$in": deleted_ids}}))
+        orphaned = set(deleted_ids) - reply_parents
+        comments = [comment for comment in comments if str(comment["_id"]) not in orphaned]
+
+    loader = get_user_loader(request) if needs_author(selected) else None
+    responses = await build_comment_responses(comments, loader)
+    if selected is not None:
+        return JSONResponse(content=dump_selected(responses, selected))
+    return model_list_response(responses)
+
+def _replies_lookup(pipeline: list, as_field: str) -> dict:
+    """최상위 댓글별 대댓글을 조회하는 $lookup 단계"""
+    return {"$lookup": {
+        "from": "comments",
+        "let": {"comment_id": {"$toString": "$_id"}},
+        "pipeline": [{"$match": {"$expr": {"$eq": ["$parent_id", "$$comment_id"]}}}] + pipeline,
+        "as": as_field,
+    }}
+
+def comment_threads_pipeline(post_id: str, cursor: Optional[str], limit: int, reply_limit: int) -> list:
+    """최상위 댓글 페이지 집계 (check_query_plans.py도 이 파이프라인으로 플랜 확인)"""
+    return [
+        {"$match": {"post_id": post_id, "parent_id": None, **keyset_filter(cursor, descending=False)}},
+        {"$sort": dict(OLDEST_FIRST)},
+        _replies_lookup([{"$count": "n"}], "reply_stats"),
+        {"$set": {"reply_count": {"$ifNull": [{"$arrayElemAt": ["$reply_stats.n", 0]}, 0]}}},
+        # 대댓글이 모두 삭제된 soft delete 댓글은 제외
+        {"$match": {"$or": [{"is_deleted": {"$ne": True}}, {"reply_count": {"$gt": 0}}]}},
+        {"$limit": limit},
+        _replies_lookup([{"$sort": dict(OLDEST_FIRST)}, {"$limit": reply_limit}], "replies")
+        if reply_limit else {"$set": {"replies": []}},
+        {"$project": {"reply_stats": 0}},
+    ]
+
+@router.get("/{post_id}/comments/threads", response_model=list[CommentThreadResponse])
+async def list_comment_threads(
+    post_id: str,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    reply_limit: int = 3,
+):
+    """최상위 댓글을 페이지 단위로 조회 (대댓글 수 + 앞쪽 대댓글 reply_limit개 포함)"""
+    db = get_db(request)
+    limit = min(max(limit, 1), 100)
+    reply_limit = min(max(reply_limit, 0), 20)
+    post_oid = parse_object_id(post_id)
+
+    pipeline = comment_threads_pipeline(post_id, cursor, limit, reply_limit)
+    threads = await db.comments.aggregate(pipeline).to_list(length=limit)
+
+    if not threads and not await db.posts.find_one({"_id": post_oid}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    cursor_value = next_cursor(threads, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+
+    loader = get_user_loader(request)
+    await loader.load_many(
+        [thread.get("author_id") for thread in threads]
+        + [reply.get("author_id") for thread in threads for reply in thread["replies"]]
+    )
+    results = []
+    for thread, base in zip(threads, await build_comment_responses(threads, loader)):
+        replies = thread["replies"]
+        results.append(CommentThreadResponse(
+            **base.model_dump(),
+            reply_count=thread["reply_count"],
+            replies=await build_comment_responses(replies, loader),
+            replies_next_cursor=encode_cursor(replies[-1]) if replies and thread["reply_count"] > len(replies) else None,
+        ))
+    return results
+
+@router.get("/{post_id}/comments/{comment_id}/replies", response_model=list[CommentResponse])
+async def list_comment_replies(
+    post_id: str,
+    comment_id: str,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+):
+    """대댓글 더 보기 (list_comment_threads의 replies_next_cursor로 이어서 조회)"""
+    db = get_db(request)
+    limit = min(max(limit, 1), 100)
+    comment_oid = parse_object_id(comment_id)
+
+    # 부모 댓글이 이 게시글에 있어야 함 (대댓글이 없거나 다음 페이지여도 확인)
+    if not await db.comments.find_one({"_id": comment_oid, "post_id": post_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    query = {"parent_id": comment_id, **keyset_filter(cursor, descending=False)}
+    replies = await db.comments.find(query).sort(OLDEST_FIRST).limit(limit).to_list(length=limit)
+
+    cursor_value = next_cursor(replies, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+
+    return await build_comment_responses(replies, get_user_loader(request))
 
 @router.post("/{post_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
-async def create_comment(post_id: str, payload: CommentCreate, request: Request, user_id: str = Depends(get_current_user)):
+async def create_comment(
+    post_id: str,
+    payload: CommentCreate,
+    request: Request,
+    user_id: str = Depends(get_current_user),
+    user: dict = Depends(get_current_user_card),
+):
     db = get_db(request)
     post = await db.posts.find_one({"_id": parse_object_id(post_id)})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
     parent_id = payload.parent_id
     if parent_id:
         parent = await db.comments.find_one({"_id": parse_object_id(parent_id)})
@@ -372,7 +524,7 @@ async def create_comment(post_id: str, payload: CommentCreate, request: Request,
     
     # 자신의 게시글/댓글에는 알림/푸시 알림 안 함
     if recipient_id != user_id:
-        await db.notifications.insert_one({
+        notification = await db.notifications.insert_one({
             "recipient_id": recipient_id,
             "actor_id": user_id,
             "actor_username": user["username"],
@@ -386,35 +538,20 @@ async def create_comment(post_id: str, payload: CommentCreate, request: Request,
             "updated_at": None,
         })
 
-        # 푸시 알림 전송
-        recipient = await db.users.find_one({"_id": ObjectId(recipient_id)})
-        recipient_tokens = recipient.get("device_tokens", []) if recipient else []
-        if recipient_tokens:
-            try:
-                notification_type = "댓글" if not parent_id else "답글"
-                print(f"\n📤 {notification_type} 푸시 알림 발송 시도")
-                print(f"  수신자: {recipient.get('email')}")
-                print(f"  토큰 수: {len(recipient_tokens)}")
-                print(f"  메시지: {message}")
-                
-                async def handle_invalid_token(token: str):
-                    await remove_invalid_token(str(recipient["_id"]), token, db)
-                
-                result = await send_push_notification(
-                    recipient_tokens,
-                    "새 댓글 💬" if not parent_id else "새 답글 💬",
-                    message,
-                    on_invalid_token=handle_invalid_token
-                )
-                print(f"  결과: {result}\n")
-            except Exception as e:
-                print(f"\n❌ {notification_type} 푸시 알림 발송 실패: {e}\n")
-        else:
-            notification_type = "댓글" if not parent_id else "답글"
-            print(f"\n⚠️ {notification_type} 알림 미발송: 대상 유저 또는 token 없음\n")
+        # 푸시 알림은 outbox에 저장하고 워커가 전송
+        await enqueue_push(
+            db,
+            recipient_id,
+            "새 댓글 💬" if not parent_id else "새 답글 💬",
+            message,
+            notification_type=notification_type,
+            post_id=post_id,
+            actor_id=user_id,
+            actor_name=user["display_name"],
+            notification_id=notification.inserted_id,
+        )
 
-    
-    return await build_comment_response(comment_doc, db)
+    return await build_comment_response(comment_doc, get_user_loader(request))
 
 @router.put("/{post_id}/comments/{comment_id}", response_model=CommentResponse)
 async def update_comment(post_id: str, comment_id: str, payload: CommentUpdate, request: Request, user_id: str = Depends(get_current_user)):
@@ -449,7 +586,7 @@ async def update_comment(post_id: str, comment_id: str, payload: CommentUpdate,
     if payload.image_url is not None:
         comment["image_url"] = payload.image_url
     comment["updated_at"] = updated_at
-    return await build_comment_response(comment, db)
+    return await build_comment_response(comment, get_user_loader(request))
 
 @router.delete("/{post_id}/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(post_id: str, comment_id: str, request: Request, user_id: str = Depends(get_current_user)):
@@ -1,24 +1,16 @@
 
 from fastapi import APIRouter, HTTPException, Depends, status, Request, Body
 from models.guestbook import GuestbookCreate, GuestbookUpdate, GuestbookResponse
-from utils.auth import get_current_user
+from utils.auth import get_current_user, get_optional_current_user
 from utils.database import get_db, parse_object_id
+from utils.user_loader import get_current_user_card, get_user_loader
+from utils.user_cache import invalidate_author_card
+from utils.likes import liked_post_ids, likes_count
+from utils.fields import parse_fields, build_projection
 from typing import Dict
 from datetime import datetime, timezone
 from typing import Optional
-from bson import ObjectId
-from utils.push_notification import send_push_notification, PushNotificationError
-
-async def remove_invalid_token(user_id: str, invalid_token: str, db):
-    """무효한 토큰을 device_tokens 배열에서 제거"""
-    try:
-        await db.users.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$pull": {"device_tokens": invalid_token}}
-        )
-        print(f"  ✅ 사용자 {user_id}의 무효 토큰 제거됨")
-    except Exception as e:
-        print(f"  ❌ 토큰 제거 실패: {e}")
+from utils.push_outbox import enqueue_push
 
 router = APIRouter(prefix="/api/profiles", tags=["Profiles"])
 
@@ -57,6 +49,7 @@ async def update_profile_image(user_id: str, image_url: str, request: Request, c
         {"_id": parse_object_id(user_id)},
         {"$set": {"profile_image": image_url}}
     )
+    await invalidate_author_card(db, user_id)
     
     user = await db.users.find_one({"_id": parse_object_id(user_id)})
     return {
@@ -81,6 +74,7 @@ async def update_header_image(user_id: str, image_url: str, request: Request, cu
         {"_id": parse_object_id(user_id)},
         {"$set": {"header_image": image_url}}
     )
+    await invalidate_author_card(db, user_id)
     
     user = await db.users.find_one({"_id": parse_object_id(user_id)})
     return {
@@ -106,6 +100,7 @@ async def update_display_name_color(user_id: str, body: Dict = Body(...), reques
         {"_id": parse_object_id(user_id)},
         {"$set": {"display_name_color": color}}
     )
+    await invalidate_author_card(db, user_id)
     
     user = await db.users.find_one({"_id": parse_object_id(user_id)})
     return {
@@ -119,17 +114,37 @@ async def update_display_name_color(user_id: str, body: Dict = Body(...), reques
         "created_at": user["created_at"],
     }
 
+USER_POST_FIELDS = [
+    "id", "author_id", "author_username", "author_display_name", "author_profile_image",
+    "content", "image_url", "likes_count", "liked_by", "created_at", "updated_at", "liked_by_me",
+]
+
 # 사용자별 게시글 조회
 @router.get("/{user_id}/posts")
-async def get_user_posts(user_id: str, request: Request):
+async def get_user_posts(
+    user_id: str,
+    request: Request,
+    fields: Optional[str] = None,
+    viewer_id: Optional[str] = Depends(get_optional_current_user),
+):
     db = get_db(request)
+    selected = parse_fields(fields, USER_POST_FIELDS)
     user = await db.users.find_one({"_id": parse_object_id(user_id)})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    cursor = db.posts.find({"author_id": user_id}).sort("created_at", -1)
+    projection = build_projection(selected, ["_id", "author_id", "created_at"])
+    cursor = db.posts.find({"author_id": user_id}, projection).sort("created_at", -1)
     posts = await cursor.to_list(length=100)
     
+    # 작성자는 모두 프로필 주인이므로 이미 조회한 문서를 로더에 등록해 재사용
+    loader = get_user_loader(request)
+    loader.prime(user)
+    await loader.load_many(post.get("author_id") for post in posts)
+    liked_ids = None
+    if selected is None or "liked_by_me" in selected:
+        liked_ids = await liked_post_ids(db, viewer_id, [str(post["_id"]) for post in posts])
+
     result = []
     author_username = user.get("username", "")
     author_display_name = user.get("display_name", "")
@@ -137,14 +152,11 @@ async def get_user_posts(user_id: str, request: Request):
         liked_by = post.get("liked_by", [])
         author_profile_image = post.get("author_profile_image")
         
-        # author_profile_image가 없으면 user collection에서 조회
+        # author_profile_image가 없으면 user collection에서 조회한 값 사용
         if not author_profile_image:
-            try:
-                post_author = await db.users.find_one({"_id": ObjectId(post["author_id"])})
-                if post_author:
-                    author_profile_image = post_author.get("profile_image")
-            except:
-                pass
+            post_author = loader.get(post.get("author_id"))
+            if post_author:
+                author_profile_image = post_author.get("profile_image")
         
         result.append({
             "id": str(post["_id"]),
@@ -154,11 +166,14 @@ async def get_user_posts(user_id: str, request: Request):
             "author_profile_image": author_profile_image,
             "content": post.get("content", ""),
             "image_url": post.get("image_url"),
-            "likes_count": len(liked_by),
+            "likes_count": likes_count(post),
             "liked_by": liked_by,
             "created_at": post["created_at"],
             "updated_at": post.get("updated_at"),
+            "liked_by_me": str(post["_id"]) in liked_ids if liked_ids is not None else None,
         })
+    if selected is not None:
+        return [{key: item[key] for key in USER_POST_FIELDS if key in selected} for item in result]
     return result
 
 # 방명록 조회
@@ -172,9 +187,7 @@ async def get_guestbook(user_id: str, request: Request):
     cursor = db.guestbook.find({"profile_user_id": user_id}).sort("created_at", -1)
     entries = await cursor.to_list(length=100)
     
-    author_ids = list({entry["author_id"] for entry in entries})
-    authors = await db.users.find({"_id": {"$in": [ObjectId(aid) for aid in author_ids]}}).to_list(length=200)
-    author_map = {str(author["_id"]): author for author in authors}
+    author_map = await get_user_loader(request).load_many(entry["author_id"] for entry in entries)
 
     return [
         GuestbookResponse(
@@ -194,18 +207,18 @@ async def get_guestbook(user_id: str, request: Request):
 
 # 방명록 작성
 @router.post("/{user_id}/guestbook", response_model=GuestbookResponse, status_code=status.HTTP_201_CREATED)
-async def create_guestbook_entry(user_id: str, payload: GuestbookCreate, request: Request, current_user_id: str = Depends(get_current_user)):
+async def create_guestbook_entry(
+    user_id: str,
+    payload: GuestbookCreate,
+    request: Request,
+    author: dict = Depends(get_current_user_card),
+):
     db = get_db(request)
     
     # 프로필 주인 확인
-    profile_user = await db.users.find_one({"_id": parse_object_id(user_id)})
+    profile_user = await db.users.find_one({"_id": parse_object_id(user_id)}, {"_id": 1})
     if not profile_user:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    # 작성자 정보
-    author = await db.users.find_one({"_id": ObjectId(current_user_id)})
-    if not author:
-        raise HTTPException(status_code=404, detail="Author not found")
 
     recipient_id = str(profile_user["_id"])
     actor_id = str(author["_id"])
@@ -227,7 +240,7 @@ async def create_guestbook_entry(user_id: str, payload: GuestbookCreate, request
     
     # 알림 및 푸시 알림 생성 (자신의 방명록에는 알림/푸시 알림 안 함)
     if recipient_id != actor_id:
-        await db.notifications.insert_one({
+        notification = await db.notifications.insert_one({
             "recipient_id": recipient_id,
             "actor_id": actor_id,
             "actor_username": author["username"],
@@ -241,21 +254,17 @@ async def create_guestbook_entry(user_id: str, payload: GuestbookCreate, request
             "updated_at": None,
         })
 
-        # 푸시 알림 전송
-        device_tokens = profile_user.get("device_tokens", [])
-        if device_tokens:
-            try:
-                async def handle_invalid_token(token: str):
-                    await remove_invalid_token(str(profile_user["_id"]), token, db)
-                
-                await send_push_notification(
-                    device_tokens,
-                    "새 방명록 글 📝",
-                    f"{author['display_name']}님이 방명록에 글을 남겼습니다.",
-                    on_invalid_token=handle_invalid_token
-                )
-            except Exception as e:
-                print(f"  ⚠️ 방명록 푸시 알림 발송 실패: {e}")
+        # 푸시 알림은 outbox에 저장하고 워커가 전송
+        await enqueue_push(
+            db,
+            recipient_id,
+            "새 방명록 글 📝",
+            f"{author['display_name']}님이 방명록에 글을 남겼습니다.",
+            notification_type="guestbook",
+            actor_id=actor_id,
+            actor_name=author["display_name"],
+            notification_id=notification.inserted_id,
+        )
     
     return GuestbookResponse(
         id=str(entry_doc["_id"]),
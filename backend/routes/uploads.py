@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status
 from utils.auth import get_current_user
 from utils.cloudinary import upload_image
@@ -18,7 +19,8 @@ async def upload_image_file(file: UploadFile = File(...), user_id: str = Depends
     await file.seek(0)
 
     try:
-        result = upload_image(file.file)
+        # SDK import/설정과 업로드 HTTP 요청 모두 동기 호출이므로 스레드에서 실행
+        result = await asyncio.to_thread(upload_image, file.file)
         return {
             "url": result.get("secure_url"),
             "public_id": result.get("public_id"),
@@ -1,16 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Request
 from models.user import UserCreate, UserLogin, UserResponse, UserUpdate, Token, DeviceTokenRequest
-from utils.auth import hash_password, verify_password, create_access_token, get_current_user
+from utils.auth import hash_password_async, verify_password_async, create_access_token, get_current_user
 from utils.database import get_db
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from utils.user_loader import get_current_user_doc
+from utils.user_cache import invalidate_author_card
+from utils.device_tokens import register_device_token
+from utils.fast_json import model_list_response
+from utils.rate_limit import limiter
 from datetime import datetime, timezone
 from typing import Optional
 from bson import ObjectId
 import os
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
-limiter = Limiter(key_func=get_remote_address)
 
 def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
     if dt is None:
@@ -37,7 +39,7 @@ async def signup(request: Request, user: UserCreate):
     user_dict = {
         "username": user.username,
         "email": user.email,
-        "password": hash_password(user.password),
+        "password": await hash_password_async(user.password),
         "display_name": user.display_name,
         "bio": user.bio,
         "profile_image": None,
@@ -75,7 +77,7 @@ async def login(request: Request, user: UserLogin):
     
     # 사용자 찾기
     db_user = await db.users.find_one({"email": user.email})
-    if not db_user or not verify_password(user.password, db_user["password"]):
+    if not db_user or not await verify_password_async(user.password, db_user["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # 토큰 생성
@@ -98,13 +100,7 @@ async def login(request: Request, user: UserLogin):
 
 # 내 프로필 조회
 @router.get("/me", response_model=UserResponse)
-async def get_my_profile(request: Request, user_id: str = Depends(get_current_user)):
-    db = get_db(request)
-    
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+async def get_my_profile(user: dict = Depends(get_current_user_doc)):
     return UserResponse(
         id=str(user["_id"]),
         username=user["username"],
@@ -119,12 +115,9 @@ async def get_my_profile(request: Request, user_id: str = Depends(get_current_us
 
 # 내 프로필 수정
 @router.put("/me", response_model=UserResponse)
-async def update_my_profile(payload: UserUpdate, request: Request, user_id: str = Depends(get_current_user)):
+async def update_my_profile(payload: UserUpdate, request: Request, user: dict = Depends(get_current_user_doc)):
     db = get_db(request)
-
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user_id = str(user["_id"])
 
     updates = {}
 
@@ -149,11 +142,14 @@ async def update_my_profile(payload: UserUpdate, request: Request, user_id: str
 
     if updates:
         await db.users.update_one(
-            {"_id": ObjectId(user_id)},
+            {"_id": user["_id"]},
             {"$set": updates}
         )
+        await invalidate_author_card(db, user_id)
+        # 다시 조회하지 않고 변경 사항을 반영해 응답
+        user = {**user, **updates}
+        request.state.current_user_doc = user
 
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
     return UserResponse(
         id=str(user["_id"]),
         username=user["username"],
@@ -219,7 +215,7 @@ async def get_all_users(
     cursor = db.users.find(user_filter).sort("created_at", -1).limit(limit)
     users = await cursor.to_list(length=limit)
     
-    return [
+    return model_list_response([
         UserResponse(
             id=str(user["_id"]),
             username=user["username"],
@@ -232,7 +228,7 @@ async def get_all_users(
             created_at=ensure_utc(user["created_at"])
         )
         for user in users
-    ]
+    ])
 @router.post("/device-token")
 async def save_device_token(
     token_data: DeviceTokenRequest,
@@ -241,9 +237,6 @@ async def save_device_token(
 ):
     db = get_db(request)
     
-    await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$addToSet": {"device_tokens": token_data.device_token}}
-    )
+    await register_device_token(db, user_id, token_data.device_token, token_data.platform)
     
     return {"message": "Device token saved"}
\ No newline at end of file
@@ -1,6 +1,11 @@
+import asyncio
 import bcrypt
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from typing import Optional
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
@@ -9,12 +14,21 @@ from dotenv import load_dotenv
 load_dotenv()
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 _ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 _ACCESS_TOKEN_EXPIRE_DAYS = os.getenv("ACCESS_TOKEN_EXPIRE_DAYS", "3650")
 
+# bcrypt 전용 스레드 풀 (해시 1회 ~250ms 동안 이벤트 루프가 멈추지 않도록)
+# 워커 수만큼만 동시에 해시하고 나머지는 대기 → 로그인이 몰려도 CPU를 모두 쓰지 않음
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+# 검증된 JWT 캐시 크기 (토큰 → (sub, exp))
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "10000"))
+
 
 def _access_token_expires_at() -> datetime:
     if _ACCESS_TOKEN_EXPIRE_MINUTES is not None:
@@ -30,6 +44,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 확인"""
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
+async def hash_password_async(password: str) -> str:
+    """비밀번호 해시화 (bcrypt 스레드 풀에서 실행)"""
+    return await asyncio.get_running_loop().run_in_executor(_password_executor, hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """비밀번호 확인 (bcrypt 스레드 풀에서 실행)"""
+    return await asyncio.get_running_loop().run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
 def create_access_token(data: dict) -> str:
     """JWT 토큰 생성"""
     to_encode = data.copy()
@@ -38,6 +62,65 @@ def create_access_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class VerifiedTokenCache:
+    """서명 검증을 통과한 토큰의 LRU 캐시 + 적중/미스 카운터
+
+    같은 토큰이 요청마다 다시 검증되지 않도록 (sub, exp)만 보관한다.
+    exp가 지난 항목은 조회 시 제거되어 다시 jwt.decode를 거친다 (만료 → 401).
+    검증에 실패한 토큰은 저장하지 않는다.
+    """
+
+    def __init__(self, max_size: int = VERIFIED_TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, token: str) -> Optional[str]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        user_id, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return user_id
+
+    def set(self, token: str, user_id: str, expires_at: Optional[float]):
+        if self.max_size <= 0:
+            return
+        self._entries[token] = (user_id, float("inf") if expires_at is None else float(expires_at))
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
 def decode_token(token: str) -> dict:
     """JWT 토큰 디코딩"""
     try:
@@ -46,11 +129,27 @@ def decode_token(token: str) -> dict:
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """현재 로그인한 사용자 가져오기"""
-    token = credentials.credentials
+def verify_token(token: str) -> str:
+    """토큰을 검증하고 사용자 ID 반환 (검증 결과는 verified_token_cache에 보관)"""
+    user_id = verified_token_cache.get(token)
+    if user_id is not None:
+        return user_id
     payload = decode_token(token)
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
-    return user_id
\ No newline at end of file
+    verified_token_cache.set(token, user_id, payload.get("exp"))
+    return user_id
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """현재 로그인한 사용자 가져오기"""
+    return verify_token(credentials.credentials)
+
+async def get_optional_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> Optional[str]:
+    """로그인한 경우 사용자 ID, 아니면 None (공개 API에서 사용자별 정보 표시용)"""
+    if credentials is None:
+        return None
+    try:
+        return verify_token(credentials.credentials)
+    except HTTPException:
+        return None
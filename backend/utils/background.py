@@ -0,0 +1,59 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+from pymongo.errors import DuplicateKeyError
+
+# 이 프로세스를 구분하는 이름 (lease 소유자)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def run_periodically(name: str, interval: float, job: Callable[[], Awaitable[object]], run_first: bool = False):
+    """interval초마다 job 실행 (예외는 기록만 하고 계속 실행). run_first면 시작하자마자 한 번 실행"""
+    first = run_first
+    while True:
+        if not first:
+            await asyncio.sleep(interval)
+        first = False
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ 백그라운드 작업 실패 [{name}]: {e}")
+
+
+def start_background_task(app, coro) -> asyncio.Task:
+    """앱 종료 시 함께 취소되도록 백그라운드 작업 등록"""
+    if not hasattr(app.state, "background_tasks"):
+        app.state.background_tasks = []
+    task = asyncio.create_task(coro)
+    app.state.background_tasks.append(task)
+    return task
+
+
+async def stop_background_tasks(app):
+    tasks = getattr(app.state, "background_tasks", [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    app.state.background_tasks = []
+
+
+async def acquire_lease(db, name: str, owner: str, ttl: float) -> bool:
+    """여러 워커/인스턴스 중 하나만 작업하도록 ttl초 동안 유효한 lease 획득
+
+    만료된 lease나 자신이 가진 lease만 가져올 수 있다.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        await db.leases.find_one_and_update(
+            {"_id": name, "$or": [{"expires_at": {"$lte": now}}, {"owner": owner}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl)}},
+            upsert=True,
+        )
+        return True
+    except DuplicateKeyError:
+        # 다른 워커가 유효한 lease를 가지고 있음
+        return False
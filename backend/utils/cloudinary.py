@@ -1,18 +1,41 @@
-import cloudinary
-import cloudinary.uploader
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from utils.startup_timing import record_init_cost
 
 load_dotenv()
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True,
-)
+# cloudinary SDK는 처음 업로드할 때 import/설정
+_config_lock = threading.Lock()
+_configured = False
+
+
+def configure_cloudinary():
+    global _configured
+    if _configured:
+        return
+    with _config_lock:
+        if _configured:
+            return
+        started = time.perf_counter()
+        import cloudinary
+        import cloudinary.uploader
+
+        cloudinary.config(
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+            secure=True,
+        )
+        _configured = True
+        print(f"⏱️ Cloudinary init: {record_init_cost('cloudinary', started):.0f} ms")
+
 
 def upload_image(file_obj, folder: str = "sns") -> dict:
+    configure_cloudinary()
+    import cloudinary.uploader
+
     return cloudinary.uploader.upload(
         file_obj,
         folder=folder,
@@ -0,0 +1,52 @@
+import os
+from utils.background import acquire_lease
+
+# 자식 댓글이 없는 soft delete 댓글을 주기적으로 완전 삭제
+COMMENT_SWEEP_INTERVAL_SECONDS = float(os.getenv("COMMENT_SWEEP_INTERVAL_SECONDS", "300"))
+COMMENT_SWEEP_BATCH_SIZE = 500
+
+
+async def find_orphan_deleted_comments(db, limit: int = COMMENT_SWEEP_BATCH_SIZE) -> list:
+    """대댓글이 하나도 남지 않은 soft delete된 최상위 댓글 ID 목록"""
+    pipeline = [
+        {"$match": {"is_deleted": True, "parent_id": None}},
+        {"$lookup": {
+            "from": "comments",
+            "let": {"comment_id": {"$toString": "$_id"}},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$parent_id", "$$comment_id"]}}},
+                {"$limit": 1},
+                {"$project": {"_id": 1}},
+            ],
+            "as": "replies",
+        }},
+        {"$match": {"replies": {"$size": 0}}},
+        {"$limit": limit},
+        {"$project": {"_id": 1}},
+    ]
+    return [doc["_id"] async for doc in db.comments.aggregate(pipeline)]
+
+
+async def sweep_deleted_comments(db) -> int:
+    orphan_ids = await find_orphan_deleted_comments(db)
+    if not orphan_ids:
+        return 0
+    # 조회 이후 대댓글이 달린 댓글은 남기도록 삭제 직전에 다시 확인
+    reply_parents = set(await db.comments.distinct(
+        "parent_id", {"parent_id": {"$in": [str(oid) for oid in orphan_ids]}}
+    ))
+    orphan_ids = [oid for oid in orphan_ids if str(oid) not in reply_parents]
+    if not orphan_ids:
+        return 0
+    result = await db.comments.delete_many({"_id": {"$in": orphan_ids}, "is_deleted": True})
+    return result.deleted_count
+
+
+async def run_comment_sweep(db, owner: str) -> int:
+    """여러 워커 중 lease를 얻은 하나만 정리 작업 실행"""
+    if not await acquire_lease(db, "comment_sweeper", owner, COMMENT_SWEEP_INTERVAL_SECONDS):
+        return 0
+    deleted = await sweep_deleted_comments(db)
+    if deleted:
+        print(f"🧹 soft delete 댓글 {deleted}개 정리")
+    return deleted
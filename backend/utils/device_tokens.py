@@ -0,0 +1,45 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from pymongo.errors import DuplicateKeyError
+
+# 기기 토큰 저장소 (device_tokens 컬렉션)
+# - {token, owner_id, platform, created_at, last_seen_at}, token은 unique
+# - 같은 토큰을 다른 사용자가 등록하면 소유자가 바뀜 (한 기기 = 한 사용자)
+# - 앱이 토큰을 다시 등록할 때마다 last_seen_at 갱신
+# - DEVICE_TOKEN_TTL_DAYS 동안 갱신되지 않은 토큰은 전송 대상에서 빠지고 TTL 인덱스로 삭제됨 (utils/indexes.py)
+DEVICE_TOKEN_TTL_DAYS = int(os.getenv("DEVICE_TOKEN_TTL_DAYS", "60"))
+
+
+async def register_device_token(db, user_id: str, token: str, platform: Optional[str] = None):
+    now = datetime.now(timezone.utc)
+    # platform 없이 등록하는 호출(로그인/회원가입 화면)이 저장된 platform을 지우지 않도록 있을 때만 갱신
+    update = {
+        "$set": {"owner_id": user_id, "last_seen_at": now},
+        "$setOnInsert": {"created_at": now},
+    }
+    if platform is not None:
+        update["$set"]["platform"] = platform
+    else:
+        update["$setOnInsert"]["platform"] = None
+    try:
+        await db.device_tokens.update_one({"token": token}, update, upsert=True)
+    except DuplicateKeyError:
+        # 같은 토큰이 동시에 upsert됨 → 이제는 문서가 있으므로 한 번 더 갱신
+        await db.device_tokens.update_one({"token": token}, update)
+
+
+async def live_tokens(db, user_id: str) -> List[str]:
+    """만료되지 않은 사용자의 기기 토큰"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=DEVICE_TOKEN_TTL_DAYS)
+    cursor = db.device_tokens.find({"owner_id": user_id, "last_seen_at": {"$gte": cutoff}}, {"token": 1, "_id": 0})
+    return [doc["token"] async for doc in cursor]
+
+
+async def delete_device_tokens(db, tokens_by_user: Dict[str, List[str]]) -> int:
+    """무효 토큰 삭제 (여러 사용자의 토큰도 delete_many 한 번)"""
+    tokens = sorted({token for tokens in tokens_by_user.values() for token in tokens})
+    if not tokens:
+        return 0
+    result = await db.device_tokens.delete_many({"token": {"$in": tokens}})
+    return result.deleted_count
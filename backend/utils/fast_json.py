@@ -0,0 +1,27 @@
+import os
+from typing import Mapping, Optional, Sequence
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+# 큰 목록 응답의 빠른 직렬화 경로 (기본값: 꺼짐)
+# - 기본 경로: 핸들러가 만든 모델 목록을 FastAPI가 response_model로 다시 검증한 뒤 json.dumps
+# - 빠른 경로: 이미 만든 모델을 pydantic-core의 Rust 직렬화기로 바로 JSON bytes로 인코딩 (재검증 없음)
+# - 두 경로의 응답 바이트는 동일 (bench_json_responses.py로 확인)
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "0").lower() in ("1", "true")
+
+
+def dumps_models(models: Sequence[BaseModel]) -> bytes:
+    """FastAPI JSONResponse와 같은 형식(공백 없음, 비ASCII 그대로, UTC는 Z)으로 모델 목록 직렬화"""
+    return to_json(models)
+
+
+def model_list_response(models: list, headers: Optional[Mapping[str, str]] = None):
+    """FAST_JSON_RESPONSES가 켜져 있으면 직렬화한 Response, 아니면 모델 목록 그대로 반환
+
+    모델 목록을 그대로 반환하면 FastAPI가 response_model로 처리하므로
+    기본 경로에서는 headers를 핸들러의 Response 파라미터로 따로 설정해야 한다.
+    """
+    if not FAST_JSON_RESPONSES:
+        return models
+    return Response(content=dumps_models(models), media_type="application/json", headers=headers)
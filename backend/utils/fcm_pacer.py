@@ -0,0 +1,88 @@
+import asyncio
+import os
+import random
+import time
+
+# FCM 전송 속도 제한 (프로세스 전체 공유 토큰 버킷)
+# - 메시지(토큰) 1개당 토큰 1개 사용, 초당 FCM_SEND_RATE개씩 채워짐
+# - FCM이 속도 초과를 알리면 pause()로 잠시 모든 전송을 멈춤
+FCM_SEND_RATE = float(os.getenv("FCM_SEND_RATE", "500"))
+FCM_SEND_BURST = float(os.getenv("FCM_SEND_BURST", "1000"))
+FCM_MAX_RETRIES = int(os.getenv("FCM_MAX_RETRIES", "3"))
+FCM_RETRY_BASE_SECONDS = float(os.getenv("FCM_RETRY_BASE_SECONDS", "1"))
+FCM_RETRY_MAX_SECONDS = float(os.getenv("FCM_RETRY_MAX_SECONDS", "30"))
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt(0부터)번째 재시도 대기 시간: 지수 증가 + 상한 + jitter (상한의 50~100%)"""
+    ceiling = min(FCM_RETRY_MAX_SECONDS, FCM_RETRY_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class TokenBucketPacer:
+    def __init__(self, rate: float = FCM_SEND_RATE, capacity: float = FCM_SEND_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self.queued_sends = 0
+        self.queued_messages = 0
+        self.sent_messages = 0
+        self.waited_seconds = 0.0
+        self.pauses = 0
+        self.retries = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: int = 1):
+        """amount개 메시지를 보낼 수 있을 때까지 대기 (먼저 요청한 순서대로)
+
+        한 번에 capacity보다 많이 요청하면 토큰이 음수가 되고, 다음 요청이 그만큼 더 기다린다.
+        """
+        self.queued_sends += 1
+        self.queued_messages += amount
+        started = time.monotonic()
+        try:
+            async with self._lock:
+                while True:
+                    self._refill()
+                    pause = self.paused_until - time.monotonic()
+                    needed = min(amount, self.capacity) - self.tokens
+                    if pause <= 0 and needed <= 0:
+                        break
+                    await asyncio.sleep(max(pause, needed / self.rate))
+                self.tokens -= amount
+                self.sent_messages += amount
+        finally:
+            self.queued_sends -= 1
+            self.queued_messages -= amount
+            self.waited_seconds += time.monotonic() - started
+
+    def pause(self, seconds: float):
+        """FCM이 속도 초과를 알리면 모든 전송을 seconds초 동안 멈춤"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.pauses += 1
+
+    @property
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "tokens_available": round(self.tokens, 1),
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "queued_sends": self.queued_sends,
+            "queued_messages": self.queued_messages,
+            "sent_messages": self.sent_messages,
+            "waited_seconds": round(self.waited_seconds, 3),
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            "pauses": self.pauses,
+            "retries": self.retries,
+        }
+
+
+fcm_pacer = TokenBucketPacer()
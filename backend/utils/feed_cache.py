@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable, Optional
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from utils.pagination import encode_cursor
+from utils.user_cache import user_card_cache
+
+# 카테고리별 피드 첫 페이지 캐시 (프로세스 내)
+# - 첫 페이지를 직렬화된 JSON 조각으로 보관해 요청 시 메모리에서 바로 응답
+# - 글 작성/수정/삭제, 좋아요/취소 시 해당 카테고리의 세대 번호를 MongoDB(feed_cache_generations)에서 올림
+# - 조회 때마다 세대 번호를 _id로 한 번 읽어 캐시된 페이지보다 새로우면 다시 만듦
+#   → 여러 워커/인스턴스에서도 쓰기 직후 요청부터 새 페이지로 응답
+# - 쓴 워커는 자기 페이지를 제자리에서 고치고 세대만 따라가므로 다시 만들지 않음
+FEED_CATEGORIES = ["공지", "전체", "일상", "영화", "게임"]
+ALL_CATEGORY = "전체"
+FEED_CACHE_SIZE = int(os.getenv("FEED_CACHE_SIZE", "100"))
+# 세대 번호 갱신이 실패했을 때 다른 워커가 오래된 페이지를 응답할 수 있는 최대 시간
+FEED_CACHE_TTL_SECONDS = float(os.getenv("FEED_CACHE_TTL_SECONDS", "60"))
+
+# 캐시에는 사용자 무관한 값(liked_by_me=null)으로 저장하고 응답 시 사용자별 값으로 교체
+# (PostResponse의 마지막 필드여야 함)
+_LIKED_BY_ME_TAIL = b'"liked_by_me":null}'
+
+
+def serialize_model(model: BaseModel) -> bytes:
+    """FastAPI JSONResponse와 동일한 형식으로 직렬화"""
+    return json.dumps(
+        model.model_dump(mode="json"),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FeedPage:
+    def __init__(self, posts: list, responses: list, generation: int):
+        self.post_ids = [str(post["_id"]) for post in posts]
+        self.cursors = [encode_cursor(post) for post in posts]
+        self.items = [serialize_model(response) for response in responses]
+        self.generation = generation
+        self.expires_at = time.monotonic() + FEED_CACHE_TTL_SECONDS
+
+    def render(self, limit: int, liked_ids: Optional[set] = None) -> tuple[bytes, Optional[str]]:
+        """limit개까지 JSON 배열로 합치고 다음 커서를 함께 반환"""
+        items = self.items[:limit]
+        if liked_ids is not None:
+            items = [
+                item[:-len(_LIKED_BY_ME_TAIL)]
+                + (b'"liked_by_me":true}' if post_id in liked_ids else b'"liked_by_me":false}')
+                for post_id, item in zip(self.post_ids, items)
+            ]
+        cursor = self.cursors[limit - 1] if len(self.items) >= limit else None
+        return b"[" + b",".join(items) + b"]", cursor
+
+
+async def read_generation(db, key: str) -> int:
+    doc = await db.feed_cache_generations.find_one({"_id": key})
+    return doc["generation"] if doc else 0
+
+
+async def bump_generation(db, key: str) -> int:
+    doc = await db.feed_cache_generations.find_one_and_update(
+        {"_id": key},
+        {"$inc": {"generation": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["generation"]
+
+
+class FeedCache:
+    def __init__(self, size: int = FEED_CACHE_SIZE):
+        self.size = size
+        self._pages: dict[str, FeedPage] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, category: Optional[str]) -> Optional[str]:
+        """캐시 대상 카테고리 키 반환 (캐시 대상이 아니면 None)"""
+        key = category or ALL_CATEGORY
+        return key if key in FEED_CATEGORIES else None
+
+    def _get(self, key: str, generation: int) -> Optional[FeedPage]:
+        page = self._pages.get(key)
+        if page is not None and (page.generation < generation or page.expires_at <= time.monotonic()):
+            del self._pages[key]
+            return None
+        return page
+
+    async def get_or_build(self, db, key: str, builder: Callable[[int], Awaitable[tuple[list, list]]]) -> FeedPage:
+        generation = await read_generation(db, key)
+        page = self._get(key, generation)
+        if page is not None:
+            self.hits += 1
+            return page
+
+        self.misses += 1
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # 대기하는 동안 다른 요청이 이미 만들었으면 재사용
+            page = self._get(key, generation)
+            if page is not None:
+                return page
+            # 조회 전에 읽은 세대로 표시: 조회 도중 쓰기가 있었으면 다음 요청에서 다시 만듦
+            posts, responses = await builder(self.size)
+            page = FeedPage(posts, responses, generation)
+            self._pages[key] = page
+            return page
+
+    def _keys(self, categories) -> set[str]:
+        return {key for key in map(self.key_for, categories) if key is not None}
+
+    async def invalidate(self, db, *categories: Optional[str]):
+        for key in self._keys(categories):
+            self._pages.pop(key, None)
+            await bump_generation(db, key)
+
+    async def invalidate_for_post(self, db, category: Optional[str]):
+        """게시글 추가/카테고리 변경/삭제 시: 해당 카테고리와 전체 피드 무효화"""
+        await self.invalidate(db, category, ALL_CATEGORY)
+
+    async def update_post(self, db, response: BaseModel):
+        """캐시된 페이지에 있는 게시글의 직렬화 결과만 교체하고 다른 워커에는 세대 증가로 알림"""
+        item = None
+        for key in self._keys([response.category, ALL_CATEGORY]):
+            page = self._pages.get(key)
+            if page is not None and response.id in page.post_ids:
+                item = item or serialize_model(response.model_copy(update={"liked_by_me": None}))
+                page.items[page.post_ids.index(response.id)] = item
+            generation = await bump_generation(db, key)
+            # 그 사이 다른 쓰기를 놓치지 않았을 때만 고친 페이지를 계속 사용
+            page = self._pages.get(key)
+            if page is not None:
+                if page.generation == generation - 1:
+                    page.generation = generation
+                else:
+                    del self._pages[key]
+
+    async def remove_post(self, db, category: Optional[str]):
+        """삭제된 게시글이 들어 있을 수 있는 페이지 무효화 (다음 조회 때 채워짐)"""
+        await self.invalidate_for_post(db, category)
+
+    async def invalidate_author(self, db, author_id: str):
+        """작성자 프로필이 바뀌면 전체 카테고리 무효화 (다른 워커의 페이지 구성은 알 수 없음)"""
+        await self.invalidate(db, *FEED_CATEGORIES)
+
+    @property
+    def stats(self) -> dict:
+        return {"pages": len(self._pages), "hits": self.hits, "misses": self.misses}
+
+
+feed_cache = FeedCache()
+user_card_cache.listeners.append(feed_cache.invalidate_author)
@@ -0,0 +1,47 @@
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+# 목록 API의 fields= 파라미터 (sparse fieldsets)
+# - 요청한 필드만 Mongo projection으로 조회하고 응답도 해당 필드만 직렬화
+
+# 최신 사용자 정보로 채워지는 작성자 필드 (요청 시에만 사용자 조회)
+AUTHOR_FIELDS = {"author_username", "author_display_name", "author_display_name_color", "author_profile_image"}
+
+# 응답 필드 → 필요한 문서 필드 (기본값: 같은 이름의 문서 필드)
+FIELD_SOURCES = {
+    "id": [],
+    "liked_by_me": [],
+    "likes_count": ["likes_count", "liked_by"],
+}
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[set[str]]:
+    """콤마로 구분된 필드 목록 검증. 지정하지 않으면 None (전체 필드)"""
+    if not fields:
+        return None
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    selected.add("id")
+    return selected
+
+
+def build_projection(selected: Optional[set[str]], always: Iterable[str]) -> Optional[dict]:
+    """선택한 필드에 필요한 문서 필드만 조회하는 projection (전체 필드면 None)"""
+    if selected is None:
+        return None
+    projection = {name: 1 for name in always}
+    for name in selected:
+        for source in FIELD_SOURCES.get(name, [name]):
+            projection[source] = 1
+    return projection
+
+
+def needs_author(selected: Optional[set[str]]) -> bool:
+    return selected is None or bool(selected & AUTHOR_FIELDS)
+
+
+def dump_selected(models: Iterable[BaseModel], selected: set[str]) -> list[dict]:
+    return [model.model_dump(mode="json", include=selected) for model in models]
@@ -0,0 +1,149 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from utils.device_tokens import DEVICE_TOKEN_TTL_DAYS
+
+# 같은 이름의 인덱스가 다른 옵션으로 이미 있을 때의 에러 코드
+INDEX_OPTIONS_CONFLICT = 85
+
+# 라우트가 사용하는 쿼리 형태별 인덱스 목록 (컬렉션 → 인덱스)
+# 새 필터/정렬을 추가하면 여기에도 인덱스를 추가할 것
+INDEXES = {
+    "posts": [
+        # list_posts (전체): 최신순 + 커서
+        ([("created_at", DESCENDING), ("_id", DESCENDING)], {"name": "created_at_id"}),
+        # list_posts (카테고리)
+        ([("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], {"name": "category_created_at_id"}),
+        # get_user_posts
+        ([("author_id", ASCENDING), ("created_at", DESCENDING)], {"name": "author_id_created_at"}),
+    ],
+    "comments": [
+        # list_comments
+        ([("post_id", ASCENDING), ("created_at", ASCENDING)], {"name": "post_id_created_at"}),
+        # list_comment_threads (최상위 댓글 페이지)
+        ([("post_id", ASCENDING), ("parent_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], {"name": "post_id_parent_id_created_at_id"}),
+        # 대댓글 개수/목록, 부모 댓글 정리
+        ([("parent_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], {"name": "parent_id_created_at_id"}),
+        # soft delete 댓글 정리 (utils/comment_sweeper.py)
+        ([("is_deleted", ASCENDING), ("parent_id", ASCENDING)], {"name": "deleted_top_level", "partialFilterExpression": {"is_deleted": True}}),
+    ],
+    "notifications": [
+        # get_notifications
+        ([("recipient_id", ASCENDING), ("created_at", DESCENDING)], {"name": "recipient_id_created_at"}),
+        # get_unread_count
+        ([("recipient_id", ASCENDING), ("is_read", ASCENDING), ("created_at", DESCENDING)], {"name": "recipient_id_is_read_created_at"}),
+    ],
+    "guestbook": [
+        # get_guestbook
+        ([("profile_user_id", ASCENDING), ("created_at", DESCENDING)], {"name": "profile_user_id_created_at"}),
+    ],
+    "users": [
+        # signup / login
+        ([("email", ASCENDING)], {"name": "email", "unique": True}),
+        ([("username", ASCENDING)], {"name": "username", "unique": True}),
+        # get_all_users
+        ([("created_at", DESCENDING)], {"name": "created_at"}),
+    ],
+    "likes": [
+        # 좋아요 추가/취소 (중복 방지)
+        ([("post_id", ASCENDING), ("user_id", ASCENDING)], {"name": "post_id_user_id", "unique": True}),
+        # liked_by_me 조회
+        ([("user_id", ASCENDING), ("post_id", ASCENDING)], {"name": "user_id_post_id"}),
+    ],
+    "device_tokens": [
+        # 토큰 등록 (한 토큰은 한 사용자만)
+        ([("token", ASCENDING)], {"name": "token", "unique": True}),
+        # 푸시 전송 대상 조회 (utils/device_tokens.py live_tokens)
+        ([("owner_id", ASCENDING), ("last_seen_at", DESCENDING)], {"name": "owner_id_last_seen_at"}),
+        # 오래 갱신되지 않은 토큰 자동 삭제 (DEVICE_TOKEN_TTL_DAYS와 같은 기간)
+        ([("last_seen_at", ASCENDING)], {"name": "last_seen_at_ttl", "expireAfterSeconds": DEVICE_TOKEN_TTL_DAYS * 24 * 3600}),
+    ],
+    "push_outbox": [
+        # 워커가 전송할 작업 조회 (utils/push_outbox.py)
+        ([("status", ASCENDING), ("next_attempt_at", ASCENDING)], {"name": "status_next_attempt_at"}),
+        # 푸시 묶기: 키별 전송 전 문서는 하나만 / 윈도우 안 최근 푸시 조회
+        ([("coalesce_key", ASCENDING)], {"name": "coalesce_key_pending", "unique": True, "partialFilterExpression": {"status": "pending", "attempts": 0, "coalesce_key": {"$type": "string"}}}),
+        ([("coalesce_key", ASCENDING), ("created_at", DESCENDING)], {"name": "coalesce_key_created_at"}),
+        # 전송 완료 문서 자동 삭제 (sent_at은 전송 완료 시에만 설정)
+        ([("sent_at", ASCENDING)], {"name": "sent_at_ttl", "expireAfterSeconds": 7 * 24 * 3600}),
+    ],
+}
+
+
+def index_models(collection: str, background: bool = True) -> list[IndexModel]:
+    return [IndexModel(keys, background=background, **options) for keys, options in INDEXES[collection]]
+
+
+def index_names(collection: str) -> list[str]:
+    return [options["name"] for _, options in INDEXES[collection]]
+
+
+async def ensure_indexes(db, background: bool = True) -> dict:
+    """등록된 인덱스를 생성 (이미 있으면 그대로 두므로 여러 번 실행해도 안전)
+
+    인덱스마다 따로 생성하므로 하나가 실패해도 나머지는 계속 생성한다.
+    (예: 기존 중복 데이터로 unique 인덱스 실패)
+    TTL 기간만 바뀐 인덱스는 다시 만들지 않고 collMod로 expireAfterSeconds만 변경한다.
+    """
+    created = {}
+    for collection in INDEXES:
+        for keys, options in INDEXES[collection]:
+            name = options["name"]
+            try:
+                await db[collection].create_index(keys, background=background, **options)
+            except OperationFailure as e:
+                if e.code != INDEX_OPTIONS_CONFLICT or "expireAfterSeconds" not in options:
+                    print(f"⚠️ 인덱스 생성 실패 [{collection}.{name}]: {e}")
+                    continue
+                try:
+                    await update_index_ttl(db, collection, name, options["expireAfterSeconds"])
+                except Exception as e:
+                    print(f"⚠️ TTL 변경 실패 [{collection}.{name}]: {e}")
+                    continue
+            except Exception as e:
+                print(f"⚠️ 인덱스 생성 실패 [{collection}.{name}]: {e}")
+                continue
+            created.setdefault(collection, []).append(name)
+    print(f"✅ 인덱스 확인 완료: {sum(len(names) for names in created.values())}개")
+    return created
+
+
+async def update_index_ttl(db, collection: str, name: str, expire_after_seconds: int):
+    """기존 TTL 인덱스의 만료 기간 변경 (인덱스를 다시 만들지 않음)"""
+    await db.command("collMod", collection, index={"name": name, "expireAfterSeconds": expire_after_seconds})
+    print(f"🔧 TTL 변경 [{collection}.{name}]: {expire_after_seconds}초")
+
+
+async def find_missing_indexes(db) -> dict[str, list[str]]:
+    missing = {}
+    for collection in INDEXES:
+        existing = {index["name"] async for index in db[collection].list_indexes()}
+        names = [name for name in index_names(collection) if name not in existing]
+        if names:
+            missing[collection] = names
+    return missing
+
+
+async def find_unused_indexes(db) -> dict[str, list[dict]]:
+    """$indexStats 기준 서버 재시작 이후 한 번도 사용되지 않은 인덱스"""
+    unused = {}
+    for collection in INDEXES:
+        rows = []
+        async for stat in db[collection].aggregate([{"$indexStats": {}}]):
+            if stat["name"] == "_id_":
+                continue
+            if stat["accesses"]["ops"] == 0:
+                rows.append({"name": stat["name"], "since": stat["accesses"]["since"]})
+        if rows:
+            unused[collection] = rows
+    return unused
+
+
+async def find_unregistered_indexes(db) -> dict[str, list[str]]:
+    """DB에는 있지만 INDEXES에 없는 인덱스"""
+    extra = {}
+    for collection in INDEXES:
+        registered = set(index_names(collection)) | {"_id_"}
+        names = [index["name"] async for index in db[collection].list_indexes() if index["name"] not in registered]
+        if names:
+            extra[collection] = names
+    return extra
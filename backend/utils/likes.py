@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+# 좋아요는 likes 컬렉션({post_id, user_id})에 저장하고
+# 게시글에는 likes_count 카운터와 최근 좋아요 누른 사용자 일부만 유지
+# likes_count가 없는 게시글은 아직 마이그레이션 전(liked_by 배열이 전체 목록)이므로
+# 처음 좋아요/취소할 때 그 게시글만 먼저 옮긴다 (migrate_post_likes)
+LIKED_BY_PREVIEW_SIZE = 20
+
+
+async def migrate_post_likes(db, post_oid) -> bool:
+    """마이그레이션 전 게시글 하나의 liked_by를 likes 컬렉션으로 옮기고 likes_count 설정
+
+    이미 옮긴 게시글이면 False. migrate_likes.py와 같은 방식 (likes 컬렉션 기준 개수)
+    """
+    post = await db.posts.find_one({"_id": post_oid, "likes_count": {"$exists": False}}, {"liked_by": 1})
+    if post is None:
+        return False
+    post_id = str(post_oid)
+    liked_by = post.get("liked_by", [])
+    if liked_by:
+        now = datetime.now(timezone.utc)
+        await db.likes.bulk_write([
+            UpdateOne({"post_id": post_id, "user_id": user_id}, {"$setOnInsert": {"created_at": now}}, upsert=True)
+            for user_id in liked_by
+        ], ordered=False)
+    count = await db.likes.count_documents({"post_id": post_id})
+    await db.posts.update_one(
+        {"_id": post_oid, "likes_count": {"$exists": False}},
+        {"$set": {"likes_count": count, "liked_by": liked_by[-LIKED_BY_PREVIEW_SIZE:]}},
+    )
+    return True
+
+
+async def add_like(db, post_oid, user_id: str) -> bool:
+    """좋아요 추가. 새로 추가된 경우에만 True (이미 좋아요 상태면 False)"""
+    post_id = str(post_oid)
+    try:
+        result = await db.likes.update_one(
+            {"post_id": post_id, "user_id": user_id},
+            {"$setOnInsert": {"created_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # 동시에 같은 좋아요 요청이 들어온 경우 (unique 인덱스)
+        return False
+    if result.upserted_id is None:
+        return False
+
+    push_preview = {"$push": {"liked_by": {"$each": [user_id], "$slice": -LIKED_BY_PREVIEW_SIZE}}}
+    update = await db.posts.update_one(
+        {"_id": post_oid, "likes_count": {"$exists": True}},
+        {"$inc": {"likes_count": 1}, **push_preview},
+    )
+    if update.matched_count == 0 and await migrate_post_likes(db, post_oid):
+        # 옮기면서 센 개수에 이번 좋아요가 이미 포함됨 → 미리보기에만 추가
+        await db.posts.update_one({"_id": post_oid, "liked_by": {"$ne": user_id}}, push_preview)
+    return True
+
+
+async def remove_like(db, post_oid, user_id: str) -> bool:
+    """좋아요 취소. 실제로 삭제된 경우에만 True"""
+    for _ in range(2):
+        result = await db.likes.delete_one({"post_id": str(post_oid), "user_id": user_id})
+        if result.deleted_count:
+            update = await db.posts.update_one(
+                {"_id": post_oid, "likes_count": {"$exists": True}},
+                {"$inc": {"likes_count": -1}, "$pull": {"liked_by": user_id}},
+            )
+            if update.matched_count:
+                return True
+        # 마이그레이션 전 게시글 (좋아요가 liked_by 배열에만 있음) → 옮긴 뒤 한 번 더 시도
+        if not await migrate_post_likes(db, post_oid):
+            return bool(result.deleted_count)
+    return False
+
+
+async def delete_post_likes(db, post_id: str):
+    await db.likes.delete_many({"post_id": post_id})
+
+
+async def liked_post_ids(db, user_id: Optional[str], post_ids: Iterable[str]) -> Optional[set[str]]:
+    """viewer가 좋아요 누른 게시글 ID 집합 (쿼리 한 번). 비로그인이면 None"""
+    if not user_id:
+        return None
+    post_ids = list(post_ids)
+    if not post_ids:
+        return set()
+    cursor = db.likes.find({"user_id": user_id, "post_id": {"$in": post_ids}}, {"post_id": 1, "_id": 0})
+    return {like["post_id"] for like in await cursor.to_list(length=len(post_ids))}
+
+
+def likes_count(post) -> int:
+    """카운터가 없는(마이그레이션 전) 문서는 배열 길이로 대체"""
+    if "likes_count" in post:
+        return post["likes_count"]
+    return len(post.get("liked_by", []))
@@ -0,0 +1,32 @@
+import json
+import os
+from utils.auth import verified_token_cache
+from utils.background import WORKER_ID
+from utils.fcm_pacer import fcm_pacer
+from utils.push_notification import token_prune_stats
+from utils.push_outbox import push_outbox
+from utils.user_cache import user_card_cache
+
+# 프로세스 내 카운터(각 모듈의 stats)를 주기적으로, 그리고 종료 시 로그로 남김
+# - 워커마다 따로 세므로 워커 ID와 함께 출력 (합계는 로그에서 워커별 최신 값을 더함)
+# - 0이면 주기적 로그를 끄고 종료 시에만 출력
+METRICS_LOG_INTERVAL_SECONDS = float(os.getenv("METRICS_LOG_INTERVAL_SECONDS", "300"))
+
+
+def collect_stats() -> dict:
+    return {
+        # 푸시 전송 결과와 묶어서 줄인 전송 수 (coalesced)
+        "push_outbox": push_outbox.stats,
+        # 무효 토큰 정리 (삭제한 토큰 수, 삭제 쿼리 수)
+        "token_prune": dict(token_prune_stats),
+        # FCM 전송 속도 제한 (남은 토큰, 대기 중인 전송, 일시 정지)
+        "fcm_pacer": fcm_pacer.stats,
+        # 검증된 JWT 캐시 적중률
+        "verified_token_cache": verified_token_cache.stats,
+        # 작성자 카드 캐시 적중률 (Redis 백엔드여도 적중/미스는 이 워커의 조회 기준)
+        "user_card_cache": user_card_cache.stats,
+    }
+
+
+async def log_stats():
+    print(f"📈 stats [{WORKER_ID}] {json.dumps(collect_stats(), ensure_ascii=False)}")
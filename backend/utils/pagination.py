@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Optional
+from bson import ObjectId
+from fastapi import HTTPException
+
+# 키셋(커서) 페이지네이션: (created_at, _id) 기준 정렬
+NEWEST_FIRST = [("created_at", -1), ("_id", -1)]
+OLDEST_FIRST = [("created_at", 1), ("_id", 1)]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(doc) -> str:
+    """마지막 문서의 (created_at, _id)를 불투명한 커서 문자열로 인코딩"""
+    created_at = doc["created_at"]
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(doc["_id"])})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    """커서 문자열을 (created_at, _id)로 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(cursor: Optional[str], descending: bool = True) -> dict:
+    """커서 이후의 문서만 선택하는 쿼리 조건 생성 (커서가 없으면 빈 조건)"""
+    if not cursor:
+        return {}
+    created_at, oid = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        "$or": [
+            {"created_at": {op: created_at}},
+            {"created_at": created_at, "_id": {op: oid}},
+        ]
+    }
+
+
+def next_cursor(docs: list, limit: int) -> Optional[str]:
+    """페이지가 가득 찼을 때만 다음 커서를 반환"""
+    if len(docs) < limit or not docs:
+        return None
+    return encode_cursor(docs[-1])
@@ -0,0 +1,65 @@
+import os
+from typing import Optional
+from utils.background import acquire_lease
+
+# 게시글 개수 카운터 (counters 컬렉션의 문서 하나)
+# {_id: "posts", total: N, by_category: {"공지": n, "일상": n, ...}}
+# 증감은 카운터 문서가 있을 때만 적용 (upsert하면 기존 게시글이 빠진 부분 카운터가 생김)
+# 문서가 없으면 posts 컬렉션을 집계해 새로 만듦
+COUNTER_ID = "posts"
+ALL_CATEGORY = "전체"
+# 드리프트 보정 주기 (초)
+POST_COUNTER_RECONCILE_SECONDS = float(os.getenv("POST_COUNTER_RECONCILE_SECONDS", "3600"))
+
+
+async def _inc_counters(db, increments: dict):
+    result = await db.counters.update_one({"_id": COUNTER_ID}, {"$inc": increments}, upsert=False)
+    if result.matched_count == 0:
+        # 이미 반영된 posts 변경까지 포함해 집계
+        await reconcile_post_counters(db)
+
+
+async def increment_post_count(db, category: Optional[str], amount: int = 1):
+    await _inc_counters(db, {"total": amount, f"by_category.{category or ALL_CATEGORY}": amount})
+
+
+async def move_post_category(db, old_category: Optional[str], new_category: Optional[str]):
+    old_category = old_category or ALL_CATEGORY
+    new_category = new_category or ALL_CATEGORY
+    if old_category == new_category:
+        return
+    await _inc_counters(db, {f"by_category.{old_category}": -1, f"by_category.{new_category}": 1})
+
+
+async def reconcile_post_counters(db) -> dict:
+    """posts 컬렉션을 집계해 카운터를 다시 맞춤 (드리프트 보정)
+
+    집계와 저장 사이에 들어온 증감은 다음 보정 때 반영된다.
+    """
+    by_category = {}
+    total = 0
+    async for row in db.posts.aggregate([
+        {"$group": {"_id": {"$ifNull": ["$category", ALL_CATEGORY]}, "count": {"$sum": 1}}},
+    ]):
+        by_category[row["_id"]] = row["count"]
+        total += row["count"]
+
+    counters = {"total": total, "by_category": by_category}
+    await db.counters.update_one({"_id": COUNTER_ID}, {"$set": counters}, upsert=True)
+    return counters
+
+
+async def run_post_counter_reconcile(db, owner: str) -> Optional[dict]:
+    """여러 워커 중 lease를 얻은 하나만 posts 전체 집계 실행"""
+    if not await acquire_lease(db, "post_counter_reconcile", owner, POST_COUNTER_RECONCILE_SECONDS):
+        return None
+    return await reconcile_post_counters(db)
+
+
+async def get_post_count(db, category: Optional[str] = None) -> int:
+    counters = await db.counters.find_one({"_id": COUNTER_ID})
+    if counters is None:
+        counters = await reconcile_post_counters(db)
+    if not category or category == ALL_CATEGORY:
+        return counters.get("total", 0)
+    return counters.get("by_category", {}).get(category, 0)
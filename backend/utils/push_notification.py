@@ -1,42 +1,9 @@
-import firebase_admin
-from firebase_admin import credentials, messaging
-import os
-import json
-import tempfile
-from typing import Callable, Optional, List
+from typing import Callable, Dict, Optional, List
 import asyncio
 import inspect
-
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-LOCAL_CREDENTIAL_PATHS = [
-    os.path.join(BASE_DIR, "firebase-credentials.json"),
-    os.path.join(os.getcwd(), "firebase-credentials.json"),
-]
-
-# Firebase 초기화 (한 번만 실행)
-if not firebase_admin._apps:
-    firebase_cred_json = os.getenv("FIREBASE_CREDENTIALS")
-    
-    if firebase_cred_json:
-        # 환경변수에서 읽은 JSON 문자열을 임시 파일에 저장
-        try:
-            cred_dict = json.loads(firebase_cred_json)
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(cred_dict, f)
-                temp_cred_path = f.name
-            cred = credentials.Certificate(temp_cred_path)
-            firebase_admin.initialize_app(cred)
-            print("✅ Firebase initialized from environment variable")
-        except Exception as e:
-            print(f"❌ Firebase initialization failed: {e}")
-    else:
-        local_cred_path = next((path for path in LOCAL_CREDENTIAL_PATHS if os.path.exists(path)), None)
-        if local_cred_path:
-            cred = credentials.Certificate(local_cred_path)
-            firebase_admin.initialize_app(cred)
-            print(f"✅ Firebase initialized from local file: {local_cred_path}")
-        else:
-            print("⚠️ Firebase credentials not found. Set FIREBASE_CREDENTIALS or provide backend/firebase-credentials.json. Push notifications will be disabled.")
+from utils.fcm_pacer import fcm_pacer, backoff_delay, FCM_MAX_RETRIES
+from utils.push_transport import get_push_transport
+from utils.device_tokens import delete_device_tokens
 
 # 에러 타입 정의
 class PushNotificationError:
@@ -46,25 +13,154 @@ class PushNotificationError:
     MESSAGE_RATE_EXCEEDED = "MessageRateExceeded"  # 전송 속도 초과
     THIRD_PARTY_AUTH_ERROR = "ThirdPartyAuthError"  # Firebase 인증 오류
     INTERNAL_ERROR = "InternalError"         # Firebase 내부 오류
+    BATCH_FAILED = "BatchFailed"             # 배치 요청 자체 실패 (인증/네트워크/할당량 등, 토큰 문제 아님)
     UNKNOWN = "Unknown"                      # 미분류 오류
 
 
-def classify_error(error_message: str) -> str:
-    """Firebase 에러 메시지를 분류"""
-    error_str = str(error_message).lower()
-    
-    if "notregistered" in error_str:
+class BatchSendError(Exception):
+    """배치 요청 전체가 실패해 모든 토큰에 붙는 에러 (원래 예외는 cause)"""
+
+    def __init__(self, cause: Exception):
+        super().__init__(f"{type(cause).__name__}: {cause}")
+        self.cause = cause
+
+
+# Firebase 예외가 아닌 토큰별 에러(FakeTransport 등)의 code → 분류 (FCM v1 에러 코드)
+ERROR_CODES = {
+    "UNREGISTERED": PushNotificationError.NOT_REGISTERED,
+    "INVALID_ARGUMENT": PushNotificationError.INVALID_TOKEN,
+    "QUOTA_EXCEEDED": PushNotificationError.MESSAGE_RATE_EXCEEDED,
+    "INTERNAL": PushNotificationError.INTERNAL_ERROR,
+    "UNAVAILABLE": PushNotificationError.INTERNAL_ERROR,
+}
+
+
+def classify_exception(error: Exception) -> str:
+    """토큰별 전송 결과의 예외를 분류
+
+    INVALID_TOKEN / NOT_REGISTERED(삭제 대상)는 토큰별 응답의 UnregisteredError,
+    InvalidArgument 계열 에러에만 붙이고, 에러 메시지 문자열로는 판단하지 않는다.
+    배치의 모든 토큰이 INVALID_ARGUMENT인 경우는 send_multicast_batch가 BatchSendError로 바꿔 둔다.
+    """
+    if isinstance(error, BatchSendError):
+        return PushNotificationError.BATCH_FAILED
+
+    from firebase_admin import exceptions, messaging
+
+    if isinstance(error, messaging.UnregisteredError):
         return PushNotificationError.NOT_REGISTERED
-    elif "invalid" in error_str and "token" in error_str:
+    if isinstance(error, (messaging.SenderIdMismatchError, exceptions.InvalidArgumentError)):
         return PushNotificationError.INVALID_TOKEN
-    elif "messagerate" in error_str:
+    if isinstance(error, (messaging.QuotaExceededError, exceptions.ResourceExhaustedError)):
         return PushNotificationError.MESSAGE_RATE_EXCEEDED
-    elif "thirdparty" in error_str:
+    if isinstance(error, messaging.ThirdPartyAuthError):
         return PushNotificationError.THIRD_PARTY_AUTH_ERROR
-    elif "internal" in error_str:
+    if isinstance(error, (exceptions.InternalError, exceptions.UnavailableError)):
         return PushNotificationError.INTERNAL_ERROR
-    else:
+    if isinstance(error, exceptions.FirebaseError):
         return PushNotificationError.UNKNOWN
+    return ERROR_CODES.get(getattr(error, "code", None), PushNotificationError.UNKNOWN)
+
+
+def is_invalid_argument(error: Optional[Exception]) -> bool:
+    """FCM INVALID_ARGUMENT 에러 여부 (토큰 형식 오류일 수도, 메시지 페이로드 오류일 수도 있음)"""
+    if error is None:
+        return False
+    from firebase_admin import exceptions
+
+    return isinstance(error, exceptions.InvalidArgumentError) or getattr(error, "code", None) == "INVALID_ARGUMENT"
+
+
+# 다시 보내도 실패하는 토큰 (device_tokens 컬렉션에서 삭제 대상)
+INVALID_TOKEN_ERRORS = (PushNotificationError.NOT_REGISTERED, PushNotificationError.INVALID_TOKEN)
+
+# 무효 토큰 정리 통계
+token_prune_stats = {"pruned_tokens": 0, "writes": 0}
+
+
+def invalid_tokens(result: Optional[dict]) -> List[str]:
+    """send_push_notification 결과에서 무효 토큰만 추출"""
+    if not result:
+        return []
+    details = result.get("error_details", {})
+    return [token for error_type in INVALID_TOKEN_ERRORS for token in details.get(error_type, [])]
+
+
+async def prune_invalid_tokens(db, tokens_by_user: Dict[str, List[str]]) -> int:
+    """무효 토큰을 device_tokens 컬렉션에서 한 번에 삭제 (여러 사용자 토큰도 delete_many 한 번)"""
+    if not any(tokens_by_user.values()):
+        return 0
+    try:
+        pruned = await delete_device_tokens(db, tokens_by_user)
+    except Exception as e:
+        print(f"  ❌ 토큰 제거 실패: {e}")
+        return 0
+    token_prune_stats["pruned_tokens"] += pruned
+    token_prune_stats["writes"] += 1
+    print(f"  ✅ 무효 토큰 {pruned}개 제거됨 (사용자 {sum(1 for tokens in tokens_by_user.values() if tokens)}명)")
+    return pruned
+
+
+async def send_multicast_batch(
+    tokens: List[str], title: str, body: str, dry_run: bool = False
+) -> list[tuple[str, Optional[Exception]]]:
+    """토큰 한 배치(FCM은 최대 500개)를 전송 방식(utils/push_transport.py)으로 전송
+
+    토큰별 (토큰, 예외 또는 None) 반환. dry_run=True면 토큰/메시지 검증만 하고 실제로 보내지 않음
+    """
+    await fcm_pacer.acquire(len(tokens))
+    try:
+        results = await get_push_transport().send_multicast(tokens, title, body, dry_run)
+    except Exception as batch_error:
+        # 배치 요청 자체가 실패하면 토큰 문제가 아니므로 모든 토큰을 재시도 대상(BATCH_FAILED)으로 처리
+        error = BatchSendError(batch_error)
+        return [(token, error) for token in tokens]
+    if results and all(is_invalid_argument(error) for _, error in results):
+        # 모든 토큰이 INVALID_ARGUMENT면 메시지 자체 문제일 수 있으므로 무효 토큰으로 삭제하지 않음
+        # (다른 결과가 섞여 있을 때만 INVALID_ARGUMENT를 토큰 오류로 판단)
+        error = BatchSendError(results[0][1])
+        return [(token, error) for token, _ in results]
+    return results
+
+
+# 전송 중 바로 다시 보내볼 에러 (일시적인 속도 초과/FCM 내부 오류/배치 요청 실패)
+RETRYABLE_SEND_ERRORS = (
+    PushNotificationError.MESSAGE_RATE_EXCEEDED,
+    PushNotificationError.INTERNAL_ERROR,
+    PushNotificationError.BATCH_FAILED,
+)
+
+
+async def send_multicast_with_retry(tokens: List[str], title: str, body: str) -> list[tuple[str, Optional[Exception]]]:
+    """send_multicast_batch + 재시도 가능한 에러가 난 토큰만 지수 백오프(jitter)로 최대 FCM_MAX_RETRIES번 재전송"""
+    results = dict(await send_multicast_batch(tokens, title, body))
+    for attempt in range(FCM_MAX_RETRIES):
+        retry_errors = {
+            token: classify_exception(error)
+            for token, error in results.items()
+            if error is not None and classify_exception(error) in RETRYABLE_SEND_ERRORS
+        }
+        if not retry_errors:
+            break
+        delay = backoff_delay(attempt)
+        if PushNotificationError.MESSAGE_RATE_EXCEEDED in retry_errors.values():
+            # 속도 초과는 다른 전송도 같이 늦추도록 전체 pacer를 멈춤
+            fcm_pacer.pause(delay)
+        fcm_pacer.retries += len(retry_errors)
+        print(f"🔁 {len(retry_errors)}개 토큰 {delay:.1f}초 후 재전송 ({attempt + 1}/{FCM_MAX_RETRIES})")
+        await asyncio.sleep(delay)
+        results.update(await send_multicast_batch(list(retry_errors), title, body))
+    return [(token, results[token]) for token in tokens]
+
+
+async def _call_invalid_token_callback(on_invalid_token, token: str):
+    try:
+        if inspect.iscoroutinefunction(on_invalid_token):
+            await on_invalid_token(token)
+        else:
+            on_invalid_token(token)
+    except Exception as callback_error:
+        print(f"  ⚠️ 토큰 제거 콜백 실행 실패: {callback_error}")
 
 
 async def send_push_notification(
@@ -75,17 +171,22 @@ async def send_push_notification(
 ):
     """
     Firebase FCM으로 푸시 알림 전송 (async)
+
+    토큰을 전송 방식의 배치 한도(FCM은 500개)씩 묶어 멀티캐스트(send_each_for_multicast)로 전송합니다.
+    전송 속도는 utils/fcm_pacer.py의 토큰 버킷으로 제한하고, 일시적인 에러는 백오프 후 재전송합니다.
     
     Args:
         device_tokens: list of device tokens (사용자들의 디바이스 토큰)
         title: 알림 제목
         body: 알림 내용
         on_invalid_token: 무효한 토큰 발견 시 호출될 콜백 함수 (동기 또는 비동기, 토큰 문자열을 인자로 받음)
+            토큰을 DB에서 지울 때는 콜백 대신 invalid_tokens(결과) + prune_invalid_tokens()로 한 번에 제거
     
     Returns:
         dict: 성공/실패 카운트와 에러 상세정보를 포함한 응답
     """
-    if not firebase_admin._apps:
+    transport = get_push_transport()
+    if not await transport.ensure_ready():
         print("⚠️ Firebase not initialized. Push notification skipped.")
         return {"success_count": 0, "failure_count": 0, "skipped": True}
     
@@ -105,47 +206,31 @@ async def send_push_notification(
             PushNotificationError.MESSAGE_RATE_EXCEEDED: [],
             PushNotificationError.THIRD_PARTY_AUTH_ERROR: [],
             PushNotificationError.INTERNAL_ERROR: [],
+            PushNotificationError.BATCH_FAILED: [],
             PushNotificationError.UNKNOWN: [],
         }
         
-        for token in device_tokens:
-            try:
-                message = messaging.Message(
-                    notification=messaging.Notification(
-                        title=title,
-                        body=body,
-                    ),
-                    webpush=messaging.WebpushConfig(
-                        notification=messaging.WebpushNotification(
-                            title=title,
-                            body=body,
-                        ),
-                        fcm_options=messaging.WebpushFCMOptions(
-                            link=os.getenv("FRONTEND_URL", "https://my-sns-project.onrender.com") + "/",
-                        ),
-                    ),
-                    token=token,
-                )
-                response = await asyncio.to_thread(messaging.send, message)
-                print(f'✅ 메시지 전송 성공 (토큰: {token[:20]}...): {response}')
-                success_count += 1
-            except Exception as token_error:
-                error_str = str(token_error)
-                error_type = classify_error(error_str)
+        batch_size = transport.max_batch_size
+        for start in range(0, len(device_tokens), batch_size):
+            batch = device_tokens[start:start + batch_size]
+            results = await send_multicast_with_retry(batch, title, body)
+            batch_success = 0
+            for token, token_error in results:
+                if token_error is None:
+                    batch_success += 1
+                    continue
+
+                error_type = classify_exception(token_error)
                 error_details[error_type].append(token)
                 
-                if error_type in [PushNotificationError.NOT_REGISTERED, PushNotificationError.INVALID_TOKEN]:
+                if error_type in INVALID_TOKEN_ERRORS:
                     if on_invalid_token:
-                        try:
-                            if inspect.iscoroutinefunction(on_invalid_token):
-                                await on_invalid_token(token)
-                            else:
-                                on_invalid_token(token)
-                        except Exception as callback_error:
-                            print(f"  ⚠️ 토큰 제거 콜백 실행 실패: {callback_error}")
+                        await _call_invalid_token_callback(on_invalid_token, token)
                 
                 print(f'❌ 메시지 전송 실패 [{error_type}] (토큰: {token[:20]}...): {token_error}')
                 failure_count += 1
+            success_count += batch_success
+            print(f'✅ 멀티캐스트 전송 ({start // batch_size + 1}번째 배치): {batch_success}/{len(batch)}개 성공')
         
         print(f'\n총 {success_count}개 성공, {failure_count}개 실패')
         
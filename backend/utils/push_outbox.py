@@ -0,0 +1,334 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from utils.push_notification import (
+    send_push_notification,
+    invalid_tokens,
+    prune_invalid_tokens,
+    PushNotificationError,
+)
+from utils.device_tokens import live_tokens
+
+# 푸시 알림 outbox
+# - 라우트는 알림 문서와 함께 outbox 문서만 저장하고 바로 응답
+# - 백그라운드 워커가 outbox를 가져가 FCM으로 전송 (동시 전송 수 제한, 재시도, dead 상태)
+#
+# status: pending(대기) → sending(전송 중) → sent(완료) / dead(재시도 초과)
+# sending 상태에서는 next_attempt_at이 작업 lease 만료 시각이므로,
+# 워커가 죽어 만료된 작업은 다른 워커가 다시 가져간다.
+# 전송하는 동안(pacer 대기, 재시도 백오프 포함)은 lease를 계속 연장하고,
+# 완료/실패 기록은 자신의 lease_id가 그대로일 때만 반영한다.
+
+PUSH_OUTBOX_CONCURRENCY = int(os.getenv("PUSH_OUTBOX_CONCURRENCY", "4"))
+PUSH_OUTBOX_MAX_ATTEMPTS = int(os.getenv("PUSH_OUTBOX_MAX_ATTEMPTS", "5"))
+PUSH_OUTBOX_POLL_SECONDS = float(os.getenv("PUSH_OUTBOX_POLL_SECONDS", "2"))
+PUSH_OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("PUSH_OUTBOX_RETRY_BASE_SECONDS", "5"))
+PUSH_OUTBOX_LEASE_SECONDS = 60
+PUSH_OUTBOX_LEASE_RENEW_SECONDS = PUSH_OUTBOX_LEASE_SECONDS / 3
+PUSH_OUTBOX_SHUTDOWN_TIMEOUT = float(os.getenv("PUSH_OUTBOX_SHUTDOWN_TIMEOUT", "10"))
+# 전송 완료된 문서는 7일 후 TTL 인덱스로 삭제 (utils/indexes.py)
+
+# 다시 보내면 성공할 수 있는 에러
+RETRYABLE_ERRORS = {
+    PushNotificationError.MESSAGE_RATE_EXCEEDED,
+    PushNotificationError.INTERNAL_ERROR,
+    PushNotificationError.BATCH_FAILED,
+    PushNotificationError.UNKNOWN,
+}
+
+
+# 같은 (수신자, 알림 종류, 게시글) 푸시는 윈도우 동안 하나로 묶어 전송
+# - 윈도우의 첫 푸시는 바로 전송하고, 이후 푸시는 윈도우가 끝날 때 "X님 외 N명..."으로 한 번 전송
+# - 0이면 묶지 않음
+PUSH_COALESCE_WINDOW_SECONDS = float(os.getenv("PUSH_COALESCE_WINDOW_SECONDS", "30"))
+
+# 묶인 푸시의 본문 (name: 마지막 행위자, others: 나머지 인원)
+COALESCED_BODIES = {
+    "like": "{name}님 외 {others}명이 좋아요를 눌렀습니다",
+    "comment": "{name}님 외 {others}명이 게시글에 댓글을 남겼습니다.",
+    "reply": "{name}님 외 {others}명이 댓글에 답글을 남겼습니다.",
+    "guestbook": "{name}님 외 {others}명이 방명록에 글을 남겼습니다.",
+}
+
+
+def coalesce_key(recipient_id: str, notification_type: Optional[str], post_id: Optional[str]) -> Optional[str]:
+    if PUSH_COALESCE_WINDOW_SECONDS <= 0 or notification_type not in COALESCED_BODIES:
+        return None
+    return f"{recipient_id}:{notification_type}:{post_id or ''}"
+
+
+def render_body(job: dict) -> str:
+    others = job.get("coalesced_count", 0)
+    if not others:
+        return job["body"]
+    return COALESCED_BODIES[job["type"]].format(name=job.get("actor_name") or "", others=others)
+
+
+async def _merge_pending(db, key: str, actor_id: Optional[str], actor_name: Optional[str], now: datetime):
+    """아직 한 번도 전송하지 않은 같은 키의 outbox 문서에 합침 (재시도 대기 문서는 제외)"""
+    return await db.push_outbox.find_one_and_update(
+        {"coalesce_key": key, "status": "pending", "attempts": 0},
+        {
+            "$inc": {"coalesced_count": 1},
+            "$set": {"actor_id": actor_id, "actor_name": actor_name, "updated_at": now},
+        },
+        projection={"_id": 1},
+    )
+
+
+async def enqueue_push(
+    db,
+    recipient_id: str,
+    title: str,
+    body: str,
+    notification_type: Optional[str] = None,
+    post_id: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    actor_name: Optional[str] = None,
+    notification_id=None,
+):
+    """푸시 알림을 outbox에 저장 (전송은 워커가 담당)"""
+    now = datetime.now(timezone.utc)
+    key = coalesce_key(recipient_id, notification_type, post_id)
+    next_attempt_at = now
+    if key:
+        merged = await _merge_pending(db, key, actor_id, actor_name, now)
+        if merged:
+            push_outbox.coalesced += 1
+            return merged["_id"]
+        # 윈도우 안에 이미 보낸 푸시가 있으면 윈도우가 끝날 때까지 모아서 전송
+        recent = await db.push_outbox.find_one(
+            {"coalesce_key": key, "created_at": {"$gt": now - timedelta(seconds=PUSH_COALESCE_WINDOW_SECONDS)}},
+            {"_id": 1},
+        )
+        if recent:
+            next_attempt_at = now + timedelta(seconds=PUSH_COALESCE_WINDOW_SECONDS)
+
+    try:
+        result = await db.push_outbox.insert_one({
+            "recipient_id": recipient_id,
+            "title": title,
+            "body": body,
+            "type": notification_type,
+            "post_id": post_id,
+            "actor_id": actor_id,
+            "actor_name": actor_name,
+            "notification_id": notification_id,
+            "coalesce_key": key,
+            "coalesced_count": 0,
+            "status": "pending",
+            "attempts": 0,
+            "retry_tokens": None,
+            "last_error": None,
+            "next_attempt_at": next_attempt_at,
+            "created_at": now,
+            "updated_at": None,
+        })
+    except DuplicateKeyError:
+        # 동시에 같은 키로 저장된 대기 문서가 있음 (partial unique 인덱스)
+        merged = await _merge_pending(db, key, actor_id, actor_name, now)
+        if merged:
+            push_outbox.coalesced += 1
+            return merged["_id"]
+        raise
+    if next_attempt_at <= now:
+        push_outbox.notify()
+    return result.inserted_id
+
+
+def retry_delay(attempts: int) -> float:
+    return PUSH_OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+
+
+class PushOutboxWorker:
+    def __init__(self, concurrency: int = PUSH_OUTBOX_CONCURRENCY, owner: str = ""):
+        self.concurrency = concurrency
+        self.owner = owner
+        self.db = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._in_flight: set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        # 윈도우 안에서 합쳐져 절약한 전송 수
+        self.coalesced = 0
+
+    def notify(self):
+        """새 outbox 문서가 생기면 폴링 대기 없이 바로 가져가도록 깨움"""
+        self._wakeup.set()
+
+    def start(self, db, owner: str) -> asyncio.Task:
+        self.db = db
+        self.owner = owner
+        self._stopping = False
+        self._loop_task = asyncio.create_task(self._run())
+        return self._loop_task
+
+    async def stop(self, timeout: float = PUSH_OUTBOX_SHUTDOWN_TIMEOUT):
+        """새 작업은 가져가지 않고, 전송 중인 작업은 timeout초까지 기다림"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._loop_task:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        if self._in_flight:
+            done, pending = await asyncio.wait(self._in_flight, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                # 취소된 작업은 lease가 만료되면 다른 워커가 다시 전송
+                print(f"⚠️ 푸시 outbox: 종료 시 {len(pending)}개 작업 미완료")
+
+    async def claim(self) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        return await self.db.push_outbox.find_one_and_update(
+            {"status": {"$in": ["pending", "sending"]}, "next_attempt_at": {"$lte": now}},
+            {
+                "$set": {
+                    "status": "sending",
+                    "locked_by": self.owner,
+                    "lease_id": ObjectId(),
+                    "next_attempt_at": now + timedelta(seconds=PUSH_OUTBOX_LEASE_SECONDS),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.concurrency)
+        while not self._stopping:
+            await slots.acquire()
+            try:
+                job = await self.claim() if not self._stopping else None
+            except Exception as e:
+                print(f"⚠️ 푸시 outbox 조회 실패: {e}")
+                job = None
+            if job is None:
+                slots.release()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=PUSH_OUTBOX_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._process(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _process(self, job: dict):
+        renewal = asyncio.create_task(self._renew_lease(job))
+        try:
+            await self.deliver(job)
+        except Exception as e:
+            await self._fail(job, f"{type(e).__name__}: {e}", job.get("retry_tokens"))
+        finally:
+            renewal.cancel()
+
+    def _lease_filter(self, job: dict) -> dict:
+        return {"_id": job["_id"], "status": "sending", "lease_id": job["lease_id"]}
+
+    async def _renew_lease(self, job: dict):
+        """전송이 끝날 때까지 lease 만료 시각을 계속 연장 (다른 워커가 같은 작업을 다시 가져가지 않도록)"""
+        while True:
+            await asyncio.sleep(PUSH_OUTBOX_LEASE_RENEW_SECONDS)
+            now = datetime.now(timezone.utc)
+            try:
+                result = await self.db.push_outbox.update_one(
+                    self._lease_filter(job),
+                    {"$set": {"next_attempt_at": now + timedelta(seconds=PUSH_OUTBOX_LEASE_SECONDS), "updated_at": now}},
+                )
+            except Exception as e:
+                print(f"⚠️ 푸시 outbox lease 연장 실패 [{job['_id']}]: {e}")
+                continue
+            if not result.matched_count:
+                print(f"⚠️ 푸시 outbox lease를 잃음 [{job['_id']}]")
+                return
+
+    async def deliver(self, job: dict):
+        db = self.db
+        device_tokens = await live_tokens(db, job["recipient_id"])
+        # 이전 시도에서 재시도 가능한 에러가 난 토큰만 다시 전송
+        if job.get("retry_tokens"):
+            retry_tokens = set(job["retry_tokens"])
+            device_tokens = [token for token in device_tokens if token in retry_tokens]
+        if not device_tokens:
+            await self._finish(job, "no_tokens")
+            return
+
+        result = await send_push_notification(device_tokens, job["title"], render_body(job))
+        # 전송 전체에서 모은 무효 토큰을 한 번에 제거
+        await prune_invalid_tokens(db, {job["recipient_id"]: invalid_tokens(result)})
+        if result is None:
+            await self._fail(job, "send_push_notification failed", job.get("retry_tokens"))
+            return
+        if result.get("skipped"):
+            await self._finish(job, "skipped")
+            return
+        retry_tokens = [
+            token
+            for error_type, tokens in result.get("error_details", {}).items()
+            if error_type in RETRYABLE_ERRORS
+            for token in tokens
+        ]
+        if retry_tokens:
+            await self._fail(job, f"{len(retry_tokens)} tokens failed with retryable errors", retry_tokens)
+            return
+        await self._finish(job, "sent")
+
+    async def _finish(self, job: dict, outcome: str):
+        now = datetime.now(timezone.utc)
+        result = await self.db.push_outbox.update_one(
+            self._lease_filter(job),
+            {"$set": {"status": "sent", "outcome": outcome, "sent_at": now, "updated_at": now, "retry_tokens": None}},
+        )
+        if not result.matched_count:
+            print(f"⚠️ 푸시 outbox lease를 잃어 완료 처리하지 않음 [{job['_id']}]")
+            return
+        self.sent += 1
+
+    async def _fail(self, job: dict, error: str, retry_tokens: Optional[list]):
+        now = datetime.now(timezone.utc)
+        dead = job["attempts"] >= PUSH_OUTBOX_MAX_ATTEMPTS
+        if dead:
+            update = {"status": "dead", "last_error": error, "updated_at": now}
+        else:
+            update = {
+                "status": "pending",
+                "last_error": error,
+                "retry_tokens": retry_tokens,
+                "next_attempt_at": now + timedelta(seconds=retry_delay(job["attempts"])),
+                "updated_at": now,
+            }
+        result = await self.db.push_outbox.update_one(self._lease_filter(job), {"$set": update})
+        if not result.matched_count:
+            print(f"⚠️ 푸시 outbox lease를 잃어 실패 처리하지 않음 [{job['_id']}]: {error}")
+            return
+        if dead:
+            self.dead += 1
+            print(f"❌ 푸시 outbox dead [{job['_id']}]: {error}")
+        else:
+            self.retried += 1
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+            "coalesced": self.coalesced,
+        }
+
+
+push_outbox = PushOutboxWorker()
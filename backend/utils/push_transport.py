@@ -0,0 +1,201 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from typing import List, Optional
+from utils.startup_timing import record_init_cost
+
+# 푸시 전송 방식 (PUSH_TRANSPORT)
+# - firebase: 실제 FCM (기본값)
+# - fake: 네트워크 없이 지연시간/에러/배치 한도를 흉내 내는 로컬 전송 (부하 테스트, CI용)
+PUSH_TRANSPORT = os.getenv("PUSH_TRANSPORT", "firebase")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCAL_CREDENTIAL_PATHS = [
+    os.path.join(BASE_DIR, "firebase-credentials.json"),
+    os.path.join(os.getcwd(), "firebase-credentials.json"),
+]
+
+# firebase_admin은 import/초기화 비용이 커서 처음 푸시를 보낼 때 초기화
+_firebase_lock = threading.Lock()
+_firebase_state = {"initialized": False, "available": False}
+
+
+def init_firebase() -> bool:
+    """Firebase 초기화 (한 번만 실행). 사용 가능하면 True"""
+    if _firebase_state["initialized"]:
+        return _firebase_state["available"]
+    with _firebase_lock:
+        if _firebase_state["initialized"]:
+            return _firebase_state["available"]
+        started = time.perf_counter()
+        import firebase_admin
+        from firebase_admin import credentials
+
+        if not firebase_admin._apps:
+            firebase_cred_json = os.getenv("FIREBASE_CREDENTIALS")
+
+            if firebase_cred_json:
+                # 환경변수의 JSON 문자열로 바로 인증 정보 생성
+                try:
+                    cred = credentials.Certificate(json.loads(firebase_cred_json))
+                    firebase_admin.initialize_app(cred)
+                    print("✅ Firebase initialized from environment variable")
+                except Exception as e:
+                    print(f"❌ Firebase initialization failed: {e}")
+            else:
+                local_cred_path = next((path for path in LOCAL_CREDENTIAL_PATHS if os.path.exists(path)), None)
+                if local_cred_path:
+                    cred = credentials.Certificate(local_cred_path)
+                    firebase_admin.initialize_app(cred)
+                    print(f"✅ Firebase initialized from local file: {local_cred_path}")
+                else:
+                    print("⚠️ Firebase credentials not found. Set FIREBASE_CREDENTIALS or provide backend/firebase-credentials.json. Push notifications will be disabled.")
+
+        _firebase_state["available"] = bool(firebase_admin._apps)
+        _firebase_state["initialized"] = True
+        print(f"⏱️ Firebase init: {record_init_cost('firebase', started):.0f} ms")
+        return _firebase_state["available"]
+
+
+async def ensure_firebase() -> bool:
+    """이벤트 루프를 막지 않도록 첫 초기화는 스레드에서 실행"""
+    if _firebase_state["initialized"]:
+        return _firebase_state["available"]
+    return await asyncio.to_thread(init_firebase)
+
+
+def build_multicast_message(tokens: List[str], title: str, body: str):
+    from firebase_admin import messaging
+
+    return messaging.MulticastMessage(
+        notification=messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        webpush=messaging.WebpushConfig(
+            notification=messaging.WebpushNotification(
+                title=title,
+                body=body,
+            ),
+            fcm_options=messaging.WebpushFCMOptions(
+                link=os.getenv("FRONTEND_URL", "https://my-sns-project.onrender.com") + "/",
+            ),
+        ),
+        tokens=tokens,
+    )
+
+
+class FirebaseTransport:
+    name = "firebase"
+    max_batch_size = 500
+
+    async def ensure_ready(self) -> bool:
+        return await ensure_firebase()
+
+    async def send_multicast(self, tokens: List[str], title: str, body: str, dry_run: bool = False) -> list:
+        from firebase_admin import messaging
+
+        # send_each_for_multicast: 토큰마다 v1 API로 전송 (FCM batch 엔드포인트는 종료되어 send_multicast는 사용 불가)
+        batch_response = await asyncio.to_thread(
+            messaging.send_each_for_multicast, build_multicast_message(tokens, title, body), dry_run
+        )
+        return [(token, response.exception) for token, response in zip(tokens, batch_response.responses)]
+
+
+class FakeFcmError(Exception):
+    """FakeTransport가 돌려주는 에러 (classify_exception이 분류할 수 있게 FCM v1 에러 코드를 code에 담음)"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeTransport:
+    """FCM 대신 쓰는 로컬 전송 방식
+
+    - 배치 지연시간: 로그정규분포 (중앙값 latency_ms, 꼬리 길이 latency_sigma)
+    - 토큰별 에러: NotRegistered / MessageRateExceeded / Internal 을 지정한 비율로 발생
+    - 배치 한도: max_batch_size보다 많은 토큰을 보내면 배치 전체가 실패
+    """
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float = 50,
+        latency_sigma: float = 0.5,
+        not_registered_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        internal_error_rate: float = 0.0,
+        max_batch_size: int = 500,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.not_registered_rate = not_registered_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.internal_error_rate = internal_error_rate
+        self.max_batch_size = max_batch_size
+        self.random = random.Random(seed)
+        self.batches = 0
+        self.messages = 0
+        self.errors = {"NotRegistered": 0, "MessageRateExceeded": 0, "Internal": 0}
+
+    @classmethod
+    def from_env(cls) -> "FakeTransport":
+        seed = os.getenv("FAKE_FCM_SEED")
+        return cls(
+            latency_ms=float(os.getenv("FAKE_FCM_LATENCY_MS", "50")),
+            latency_sigma=float(os.getenv("FAKE_FCM_LATENCY_SIGMA", "0.5")),
+            not_registered_rate=float(os.getenv("FAKE_FCM_NOT_REGISTERED_RATE", "0")),
+            rate_limit_rate=float(os.getenv("FAKE_FCM_RATE_LIMIT_RATE", "0")),
+            internal_error_rate=float(os.getenv("FAKE_FCM_INTERNAL_ERROR_RATE", "0")),
+            max_batch_size=int(os.getenv("FAKE_FCM_MAX_BATCH_SIZE", "500")),
+            seed=int(seed) if seed else None,
+        )
+
+    async def ensure_ready(self) -> bool:
+        return True
+
+    def _token_error(self) -> Optional[Exception]:
+        roll = self.random.random()
+        for name, code, rate, message in (
+            ("NotRegistered", "UNREGISTERED", self.not_registered_rate, "Requested entity was not found."),
+            ("MessageRateExceeded", "QUOTA_EXCEEDED", self.rate_limit_rate, "Sending rate exceeded."),
+            ("Internal", "INTERNAL", self.internal_error_rate, "Internal error encountered."),
+        ):
+            if roll < rate:
+                self.errors[name] += 1
+                return FakeFcmError(code, message)
+            roll -= rate
+        return None
+
+    async def send_multicast(self, tokens: List[str], title: str, body: str, dry_run: bool = False) -> list:
+        if len(tokens) > self.max_batch_size:
+            raise FakeFcmError("INVALID_ARGUMENT", f"tokens must not contain more than {self.max_batch_size} elements")
+        await asyncio.sleep(self.random.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000)
+        self.batches += 1
+        self.messages += len(tokens)
+        return [(token, self._token_error()) for token in tokens]
+
+    @property
+    def stats(self) -> dict:
+        return {"batches": self.batches, "messages": self.messages, "errors": dict(self.errors)}
+
+
+_transport = None
+
+
+def get_push_transport():
+    global _transport
+    if _transport is None:
+        _transport = FakeTransport.from_env() if PUSH_TRANSPORT == "fake" else FirebaseTransport()
+    return _transport
+
+
+def set_push_transport(transport):
+    """전송 방식 교체 (벤치마크/테스트용)"""
+    global _transport
+    _transport = transport
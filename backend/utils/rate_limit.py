@@ -0,0 +1,41 @@
+import os
+from fastapi import HTTPException, Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from utils.auth import verify_token
+
+# 요청 rate limit (slowapi + limits), 앱 전체에서 limiter 하나를 공유
+# - RATE_LIMIT_STORAGE_URI: memory:// (프로세스별 카운터)
+#   redis://host:6379 → 모든 워커/인스턴스가 같은 카운터 사용 (Valkey 등 Redis 호환 서버도 가능, redis 패키지 필요)
+# - 기본 전략은 슬라이딩 윈도우 카운터: 키당 현재/이전 윈도우 카운터 2개만 저장하고
+#   Redis에서는 체크 한 번에 스크립트 호출 한 번 (moving-window처럼 요청마다 타임스탬프를 쌓지 않음)
+# - 저장소에 연결할 수 없으면 프로세스 메모리 카운터로 대체하고 요청은 계속 처리
+#   (배포 전 check_rate_limit_storage.py로 설정한 저장소가 실제로 카운트하는지 확인)
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+
+# 쓰기 API 사용자별 제한
+POST_CREATE_RATE_LIMIT = os.getenv("POST_CREATE_RATE_LIMIT", "10/minute")
+POST_LIKE_RATE_LIMIT = os.getenv("POST_LIKE_RATE_LIMIT", "60/minute")
+
+
+def user_or_ip_key(request: Request) -> str:
+    """로그인한 요청은 사용자 ID, 아니면 IP 기준 키 (토큰 검증은 verified_token_cache 재사용)"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return f"user:{verify_token(token)}"
+        except HTTPException:
+            pass
+    return f"ip:{get_remote_address(request)}"
+
+
+# key_style="endpoint": 경로가 아니라 핸들러 기준으로 세므로 좋아요는 게시글과 상관없이 사용자당 한도
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    key_prefix="sns",
+    key_style="endpoint",
+    in_memory_fallback_enabled=True,
+)
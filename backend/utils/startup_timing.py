@@ -0,0 +1,10 @@
+import time
+
+# 지연 초기화한 SDK별 초기화 비용 (ms) - report_startup_cost.py에서 출력
+init_costs: dict[str, float] = {}
+
+
+def record_init_cost(name: str, started: float) -> float:
+    """started(time.perf_counter())부터 지금까지 걸린 시간을 기록"""
+    init_costs[name] = (time.perf_counter() - started) * 1000
+    return init_costs[name]
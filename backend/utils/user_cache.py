@@ -0,0 +1,170 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable
+
+# 작성자 카드(표시용 사용자 정보) 캐시
+# - 기본: 프로세스 내 LRU + TTL
+# - USER_CACHE_REDIS_URL 설정 시: 여러 워커가 공유하는 Redis 백엔드
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+USER_CACHE_REDIS_URL = os.getenv("USER_CACHE_REDIS_URL")
+
+AUTHOR_CARD_FIELDS = ("username", "display_name", "display_name_color", "profile_image")
+
+
+def to_author_card(user: dict) -> dict:
+    """사용자 문서에서 작성자 표시에 필요한 필드만 추출"""
+    card = {"_id": str(user["_id"])}
+    for field in AUTHOR_CARD_FIELDS:
+        if field in user:
+            card[field] = user[field]
+    return card
+
+
+class MemoryBackend:
+    """프로세스 내 LRU + TTL 백엔드"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get_many(self, user_ids: list[str]) -> dict[str, dict]:
+        now = time.monotonic()
+        found = {}
+        for user_id in user_ids:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                continue
+            expires_at, card = entry
+            if expires_at <= now:
+                del self._entries[user_id]
+                continue
+            self._entries.move_to_end(user_id)
+            found[user_id] = card
+        return found
+
+    async def set_many(self, cards: dict[str, dict]):
+        expires_at = time.monotonic() + self.ttl
+        for user_id, card in cards.items():
+            self._entries[user_id] = (expires_at, card)
+            self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, user_id: str):
+        self._entries.pop(user_id, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """여러 uvicorn 워커/인스턴스가 공유하는 Redis 백엔드 (redis 패키지 필요)"""
+
+    KEY_PREFIX = "author_card:"
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("USER_CACHE_REDIS_URL을 쓰려면 redis 패키지가 필요합니다 (pip install redis)") from e
+
+        self.ttl = ttl
+        self.client = redis.from_url(url, decode_responses=True)
+
+    async def get_many(self, user_ids: list[str]) -> dict[str, dict]:
+        if not user_ids:
+            return {}
+        values = await self.client.mget([self.KEY_PREFIX + uid for uid in user_ids])
+        return {uid: json.loads(value) for uid, value in zip(user_ids, values) if value}
+
+    async def set_many(self, cards: dict[str, dict]):
+        if not cards:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for user_id, card in cards.items():
+            pipe.set(self.KEY_PREFIX + user_id, json.dumps(card), ex=max(int(self.ttl), 1))
+        await pipe.execute()
+
+    async def delete(self, user_id: str):
+        await self.client.delete(self.KEY_PREFIX + user_id)
+
+    async def clear(self):
+        async for key in self.client.scan_iter(self.KEY_PREFIX + "*"):
+            await self.client.delete(key)
+
+
+class UserCardCache:
+    """작성자 카드 캐시 + 적중/미스 카운터
+
+    백엔드 오류는 캐시 미스로 취급해 DB 조회로 이어지도록 한다.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # 무효화 시 함께 호출될 콜백 (예: 작성자 정보가 포함된 피드 캐시)
+        self.listeners: list[Callable[[object, str], Awaitable[None]]] = []
+
+    async def get_many(self, user_ids: Iterable[str]) -> dict[str, dict]:
+        user_ids = list(user_ids)
+        try:
+            found = await self.backend.get_many(user_ids)
+        except Exception as e:
+            print(f"⚠️ 사용자 캐시 조회 실패: {e}")
+            found = {}
+        self.hits += len(found)
+        self.misses += len(user_ids) - len(found)
+        return found
+
+    async def set_many(self, users: Iterable[dict]):
+        cards = {str(user["_id"]): to_author_card(user) for user in users}
+        try:
+            await self.backend.set_many(cards)
+        except Exception as e:
+            print(f"⚠️ 사용자 캐시 저장 실패: {e}")
+
+    async def invalidate(self, db, user_id: str):
+        self.invalidations += 1
+        try:
+            await self.backend.delete(str(user_id))
+        except Exception as e:
+            print(f"⚠️ 사용자 캐시 무효화 실패: {e}")
+        for listener in self.listeners:
+            await listener(db, str(user_id))
+
+    async def clear(self):
+        await self.backend.clear()
+
+    @property
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def _create_backend():
+    if USER_CACHE_REDIS_URL:
+        return RedisBackend(USER_CACHE_REDIS_URL, USER_CACHE_TTL_SECONDS)
+    return MemoryBackend(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+
+user_card_cache = UserCardCache(_create_backend())
+
+
+async def invalidate_author_card(db, user_id: str):
+    """프로필 변경 시 호출: 캐시된 작성자 카드 제거"""
+    await user_card_cache.invalidate(db, user_id)
@@ -0,0 +1,126 @@
+from fastapi import Depends, HTTPException, Request
+from bson import ObjectId
+from typing import Iterable, Optional
+from utils.auth import get_current_user
+from utils.database import get_db
+from utils.user_cache import UserCardCache, user_card_cache
+
+# 작성자 표시에 필요한 필드만 조회
+AUTHOR_PROJECTION = {
+    "username": 1,
+    "display_name": 1,
+    "display_name_color": 1,
+    "profile_image": 1,
+}
+
+# 내 프로필 응답(UserResponse)에 필요한 필드 (비밀번호 제외)
+PROFILE_PROJECTION = {
+    **AUTHOR_PROJECTION,
+    "email": 1,
+    "bio": 1,
+    "header_image": 1,
+    "created_at": 1,
+}
+
+
+class UserLoader:
+    """요청 단위 사용자 로더 (DataLoader 방식)
+
+    한 요청에서 필요한 author_id를 모아 `$in` 쿼리 한 번으로 조회하고,
+    이미 조회한 사용자는 요청이 끝날 때까지 재사용한다.
+    요청 간 캐시(cache)가 주어지면 캐시에 없는 사용자만 DB에서 조회한다.
+    """
+
+    def __init__(self, db, cache: Optional[UserCardCache] = None):
+        self.db = db
+        self.cache = cache
+        self._users: dict[str, Optional[dict]] = {}
+        self.query_count = 0
+        self.fetched_count = 0
+
+    def prime(self, user: dict):
+        """이미 조회한 사용자 문서를 캐시에 등록"""
+        self._users[str(user["_id"])] = user
+
+    def get(self, user_id: Optional[str]) -> Optional[dict]:
+        """캐시된 사용자 반환 (조회하지 않음)"""
+        if not user_id:
+            return None
+        return self._users.get(user_id)
+
+    async def load_many(self, user_ids: Iterable[Optional[str]]) -> dict[str, dict]:
+        missing = {}
+        for user_id in user_ids:
+            if not user_id or user_id in self._users or user_id in missing:
+                continue
+            try:
+                missing[user_id] = ObjectId(user_id)
+            except Exception:
+                # 잘못된 ID는 조회하지 않고 없는 사용자로 취급
+                self._users[user_id] = None
+
+        if missing and self.cache is not None:
+            cached = await self.cache.get_many(missing.keys())
+            for user_id, card in cached.items():
+                self._users[user_id] = card
+                del missing[user_id]
+
+        if missing:
+            self.query_count += 1
+            cursor = self.db.users.find({"_id": {"$in": list(missing.values())}}, AUTHOR_PROJECTION)
+            users = await cursor.to_list(length=len(missing))
+            self.fetched_count += len(users)
+            for user in users:
+                self._users[str(user["_id"])] = user
+            for user_id in missing:
+                self._users.setdefault(user_id, None)
+            if self.cache is not None and users:
+                await self.cache.set_many(users)
+
+        return {uid: user for uid, user in self._users.items() if user is not None}
+
+    async def load(self, user_id: Optional[str]) -> Optional[dict]:
+        await self.load_many([user_id])
+        return self.get(user_id)
+
+    @property
+    def stats(self) -> dict:
+        return {"queries": self.query_count, "users_fetched": self.fetched_count}
+
+
+def get_user_loader(request: Request) -> UserLoader:
+    """요청마다 하나의 UserLoader를 생성해 request.state에 보관"""
+    loader = getattr(request.state, "user_loader", None)
+    if loader is None:
+        loader = UserLoader(get_db(request), user_card_cache)
+        request.state.user_loader = loader
+    return loader
+
+
+async def get_current_user_doc(request: Request, user_id: str = Depends(get_current_user)) -> dict:
+    """현재 사용자 문서 (PROFILE_PROJECTION)
+
+    요청당 한 번만 조회해 request.state.current_user_doc에 보관하고 UserLoader에도 등록한다.
+    """
+    user = getattr(request.state, "current_user_doc", None)
+    if user is None:
+        user = await get_db(request).users.find_one({"_id": ObjectId(user_id)}, PROFILE_PROJECTION)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        request.state.current_user_doc = user
+        get_user_loader(request).prime(user)
+    return user
+
+
+async def get_current_user_card(request: Request, user_id: str = Depends(get_current_user)) -> dict:
+    """현재 사용자의 작성자 카드 (AUTHOR_PROJECTION)
+
+    글/댓글/좋아요/방명록 작성처럼 표시용 정보만 필요한 경우 사용.
+    사용자 캐시에 있으면 DB를 조회하지 않는다.
+    """
+    user = getattr(request.state, "current_user_doc", None)
+    if user is None:
+        user = await get_user_loader(request).load(user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -714,7 +714,7 @@ function Home() {
 
   const handleToggleLike = async (post) => {
     setError('');
-    const liked = post.liked_by?.includes(user.id);
+    const liked = post.liked_by_me ?? post.liked_by?.includes(user.id);
 
     try {
       const updated = liked ? await unlikePost(post.id) : await likePost(post.id);
@@ -1259,7 +1259,7 @@ function Home() {
         {posts.length === 0 && <p>아직 게시글이 없습니다.</p>}
         {posts.map((post) => {
           const isOwner = post.author_id === user.id;
-          const liked = post.liked_by?.includes(user.id);
+          const liked = post.liked_by_me ?? post.liked_by?.includes(user.id);
           const commentTree = buildCommentTree(commentsByPost[post.id] || []);
           const isHighlighted = highlightedPostId === post.id;
           // 좋아요 누른 유저 정보 매핑
@@ -77,7 +77,7 @@ const saveFCMTokenToServer = async (token) => {
         'Content-Type': 'application/json',
         'Authorization': `Bearer ${authToken}`
       },
-      body: JSON.stringify({ device_token: token })
+      body: JSON.stringify({ device_token: token, platform: Capacitor.getPlatform() })
     });
 
     if (!response.ok) {